@@ -4,10 +4,16 @@ import os
 import random
 import re
 import asyncio
+import functools
 import time
+from collections import Counter
+from bisect import bisect_left, insort
+from heapq import heapify, heappush, heappop
+from operator import attrgetter
+from dataclasses import dataclass, field
+from aiohttp import web
 from dotenv import load_dotenv
 import nextcord
-from nextcord.ext import commands
 
 # ANSI color constants used to produce colored code-block output in Discord messages.
 CSI = "\x1b["
@@ -20,22 +26,144 @@ BLUE = CSI + "34m"
 MAGENTA = CSI + "35m"
 CYAN = CSI + "36m"
 
-# Setup bot intents and create the bot object.
+# Static ANSI block headers, assembled once at import.
+RULE = "==================================\n"
+
+def _block_header(color: str, title: str) -> str:
+    """Return the opening of an ANSI code block with a colored bold title and rule line."""
+    return f"```ansi\n{color}{BOLD}{title}{RESET}\n{RULE}"
+
+HEADER_REMAINING = _block_header(RED, "❌ Remaining Loot Items ❌")
+HEADER_ALL_ASSIGNED = _block_header(GREEN, "✅ All Items Assigned ✅")
+HEADER_LAST_ASSIGNED = _block_header(MAGENTA, "📝 Last Assigned Loot Items 📝")
+HEADER_ROLL_ORDER = _block_header(YELLOW, "🎲 Roll Order 🎲")
+HEADER_ASSIGNED = _block_header(GREEN, "✅ Assigned Items ✅")
+HEADER_UNCLAIMED = _block_header(RED, "❌ Unclaimed Items ❌")
+
+# Ephemeral notices reused across callbacks.
+MSG_SESSION_EXPIRED = "Session expired."
+MSG_ONLY_MANAGER_UNDO = "🛡️ Only the Loot Manager can use Undo."
+MSG_NOTHING_TO_UNDO = "❌ There is nothing to undo."
+MSG_NOT_TEXT_CHANNEL = "❌ Please run `/loot` in a regular text channel (not a voice-linked text chat)."
+MSG_UNEXPECTED_ERROR = "❌ An unexpected error occurred."
+MSG_STALE_VIEW = "⏳ That turn has already been handled."
+
+# Static message fragments for the control panel and final summary.
+INDICATOR_READY = "\n🎁 **Loot distribution is ready!**\n\n✍️ **Loot Manager can remove participants or click below to begin.**"
+SUMMARY_HEADER_TIMED_OUT = "⌛ **The loot session has timed out!**\n\n"
+SUMMARY_HEADER_DONE = "✅ **All items have been assigned!**\n\n"
+
+# Setup bot intents and create the bot object. The members intent is required: without it
+# the member list is dropped at connect, and VoiceChannel.members (which resolves through
+# the member cache) would miss everyone who was already in voice when the bot connected.
 intents = nextcord.Intents.default()
 intents.members = True
 intents.voice_states = True
 
-bot = commands.Bot(intents=intents)
-
-# In-memory session store and locks:
-# - loot_sessions: maps control-panel message id -> session dict
-# - session_locks: per-session asyncio.Lock to avoid race conditions
-loot_sessions: dict[int, dict] = {}
-session_locks: dict[int, asyncio.Lock] = {}
+# Slash commands only, so a plain Client is enough: no prefix-command parsing on every message.
+bot = nextcord.Client(intents=intents)
 
 # Configuration constants
 SESSION_TIMEOUT_SECONDS = 600  # seconds of inactivity before session times out
 TURN_NOT_STARTED = -1  # sentinel for "no turn has begun yet"
+REFRESH_DEBOUNCE_SECONDS = 0.05  # quiet period before a refresh renders, so click bursts collapse into one pass
+MAX_ROLLERS = 20  # voice channels larger than this are rejected before rolling
+ITEMS_PER_PAGE = 75  # 3 selects of 25 options: Discord allows 5 rows and the buttons need 2
+MAX_ACTIVE_SESSIONS = 200  # new sessions are refused while this many are live (idle ones expire via the timeout)
+ROLL_RANGE = range(1, 101)  # possible roll (and tie-breaker) values
+
+@dataclass(slots=True)
+class Roll:
+    """One participant's roll. Plain values resolved once from the Member; no live Discord models are kept."""
+    member_id: int
+    name: str  # display name at roll time
+    mention: str
+    roll: int
+    tiebreak: int  # distinct per session; only shown for tied rolls
+    skipped: bool = False  # opted out via Skip Remaining
+
+@dataclass(slots=True)
+class LootItem:
+    """One item in a loot session. Items are only ever appended, so display_number is its 1-based position."""
+    name: str
+    display_number: int
+    assigned_to: int | None = None  # member id of the owner, None while unassigned
+    assigned_order: int = -1  # session.assignment_counter value when assigned
+
+@dataclass(slots=True)
+class LootSession:
+    """
+    Per-session state for one loot distribution, keyed by the control-panel message id.
+    Slotted so the many attribute reads on the interaction paths stay cheap.
+    """
+    rolls: list[Roll]
+    items: list[LootItem]
+    unassigned_indices: list[int]  # sorted indices into items that are still unassigned
+    loot_lines: list[str]  # pre-rendered loot-list line per item (parallel to items)
+    assigned_lines: list[str]  # pre-rendered 'Assigned Items' line per item (parallel to items)
+    select_options: list[nextcord.SelectOption]  # unselected SelectOption per item, built once (parallel to items)
+    invoker_mention: str  # resolved once at creation, like the roller names/mentions
+    invoker_id: int
+    channel_id: int
+    loot_list_message_id: int
+    current_turn: int = TURN_NOT_STARTED
+    round: int = 0
+    direction: int = 1
+    just_reversed: bool = False
+    selected_items: frozenset[int] | None = None  # item indices, parsed once from the select values
+    item_page: int = 0  # page of item selects shown when more than ITEMS_PER_PAGE items are left
+    members_to_remove: frozenset[int] | None = None  # member ids parsed from the remove-select values
+    item_dropdown_message_id: int | None = None
+    control_msg: nextcord.Message | None = None  # cached message objects; None means resolve via _get_msg
+    loot_msg: nextcord.Message | None = None
+    item_msg: nextcord.Message | None = None  # last item message we sent; only used while its id is current
+    last_action: dict | None = None
+    last_control_content: str | None = None
+    last_control_view: tuple | None = None  # _control_view_signature of the components last sent with the control panel
+    last_loot_content: str | None = None
+    last_item_render: tuple | None = None  # (item message id, _item_view_signature) of the last item-message render
+    item_msg_turn: tuple | None = None  # (item message id, current_turn) when that message was sent (and pinged the picker)
+    item_view: nextcord.ui.View | None = None  # ItemDropdownView currently attached to the item message
+    control_view: nextcord.ui.View | None = None  # ControlPanelView currently attached to the control panel
+    finalize_view: nextcord.ui.View | None = None  # FinalizeView of the finalize message, while it is shown
+    timeout_gen: int = 0  # bumped on every reset/cancel; heap entries with an older generation are stale
+    refresh_task: asyncio.Task | None = None
+    refresh_pending: bool = False  # a refresh was requested while one was in flight
+    refresh_delete_item: bool = False  # OR of delete_item across coalesced refresh requests
+    expires_at: int | None = None
+    assignment_counter: int = 0
+    skipped_count: int = 0  # rollers marked 'skipped' (Skip Remaining); kept in sync with rolls
+    assigned_by_owner: dict[int, list[int]] = field(default_factory=dict)  # member id -> assigned item indices, in assignment order
+    state_version: int = 0  # bumped by _mark_changed whenever anything the builders render changes
+    items_version: int = 0  # bumped by _mark_items_changed when the set of unassigned items changes
+    cached_loot: tuple | None = None  # (items_version, loot list content)
+    cached_unassigned: tuple | None = None  # (items_version, joined loot lines of the unassigned items)
+    cached_roster: tuple | None = None  # (state_version, roll order + assigned items blocks)
+    cached_control: tuple | None = None  # ((state_version, expires_at), control panel content)
+    finalize_shown: bool = False
+    item_text_cache: dict = field(default_factory=dict)  # (current_turn, just_reversed) -> item-picker text
+    roll_rows: list[str] | None = None  # per-roller roll-order row without status; reset when participants change
+    owner_rows: list[str] | None = None  # per-roller 'Assigned Items' heading line; reset with roll_rows
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)  # serializes state mutations from concurrent callbacks
+    ended: bool = False  # set by _end_session; views holding this object treat it as expired
+    # Per-session constant text, formatted once from invoker_mention in __post_init__.
+    control_header: str = field(init=False, default="")
+    finalize_text: str = field(init=False, default="")
+
+    def __post_init__(self):
+        self.control_header = f"**(2/2)**\n\n✍️ **Loot Manager:** {self.invoker_mention}\n\n"
+        self.finalize_text = f"✍️ {self.invoker_mention}\n\nClick an action below to finish or undo the last assignment."
+
+# In-memory session store: maps control-panel message id -> LootSession
+# (each session carries its own asyncio.Lock)
+loot_sessions: dict[int, LootSession] = {}
+
+# Session timeouts: one background task (_timeout_loop) serves a min-heap of
+# (deadline, session_id, timeout_gen) entries instead of one sleeping Task per session.
+_timeout_heap: list[tuple[float, int, int]] = []
+_timeout_wakeup = asyncio.Event()
+_timeout_task: asyncio.Task | None = None
+_expiry_tasks: set[asyncio.Task] = set()  # strong refs so running expirations aren't garbage-collected
 
 # emoji mapping for numbered players (1..10) + fallback for higher counts
 NUMBER_EMOJIS = {
@@ -45,44 +173,119 @@ NUMBER_EMOJIS = {
 for i in range(11, 21):
     NUMBER_EMOJIS.setdefault(i, f"#{i}")
 
+# One non-blank line of modal input, already stripped: leading/trailing whitespace is
+# consumed outside the group, so findall yields the item lines in a single C-level scan.
+_ITEM_LINE_RE = re.compile(r"^\s*(\S.*?)\s*$", re.MULTILINE)
+
 # ---------- Helper functions ----------
-def _are_items_left(session: dict) -> bool:
-    """Return True if any item has not yet been assigned."""
-    return any(it.get("assigned_to") is None for it in session["items"])
+def _parse_item_names(text: str) -> list[str]:
+    """
+    Parse modal input (one item per line) into a flat list of item names,
+    expanding 'Nx Item' lines (e.g. '3x Mana Potion') into N copies. Blank lines
+    are ignored, and a count with no name after it is kept as a plain name.
+    Scans the leading digits by hand; this runs once per line of a 2000-char modal.
+    """
+    names = []
+    for s in _ITEM_LINE_RE.findall(text):
+        i = 0
+        n = len(s)
+        while i < n and s[i].isdecimal():
+            i += 1
+        if i and i < n and s[i] in "xX":
+            name = s[i + 1:].lstrip()
+            if name:
+                names.extend([name] * int(s[:i]))
+                continue
+        names.append(s)
+    return names
+
+def _loot_line(item: LootItem) -> str:
+    """Render one item's line for the loot list. Items never change, so this is done once per item."""
+    return f"{RED}{item.display_number}.{RESET} {item.name}\n"
+
+def _assigned_line(item: LootItem) -> str:
+    """Render one item's line under its owner in the 'Assigned Items' block, once per item."""
+    return f"- {item.name}\n"
+
+def _select_option(index: int, item: LootItem) -> nextcord.SelectOption:
+    """
+    The item's (unselected) SelectOption, label truncated to Discord's 100-char limit.
+    Built once per item and shared by every item view; selected items get a copy with default=True.
+    Sharing is safe: nextcord only reads options when serializing a view, and refreshing
+    a Select from an interaction updates its values, never its options.
+    """
+    label = f"{item.display_number}. {item.name}"
+    truncated = (label[:97] + "...") if len(label) > 100 else label
+    return nextcord.SelectOption(label=truncated, value=str(index))
 
-def _advance_turn_snake(session: dict) -> None:
+def _render_new_items(session: LootSession, start: int) -> None:
+    """
+    Pre-render session.items[start:] (loot line, assigned line, select option) in one pass
+    and mark them unassigned. Used for the initial items and for ones added later.
+    """
+    loot_lines = session.loot_lines
+    assigned_lines = session.assigned_lines
+    select_options = session.select_options
+    for i, it in enumerate(session.items[start:], start):
+        loot_lines.append(_loot_line(it))
+        assigned_lines.append(_assigned_line(it))
+        select_options.append(_select_option(i, it))
+    session.unassigned_indices.extend(range(start, len(session.items)))
+
+def _button(callback, **kwargs) -> nextcord.ui.Button:
+    """A Button with its callback bound at creation, so views need no custom_id dispatch pass."""
+    button = nextcord.ui.Button(**kwargs)
+    button.callback = callback
+    return button
+
+def _mark_changed(session: LootSession) -> None:
+    """Invalidate the memoized message contents after a change to items, rolls or turn state."""
+    session.state_version += 1
+
+def _mark_items_changed(session: LootSession) -> None:
+    """Like _mark_changed, and also invalidate the loot list, which only depends on the unassigned items."""
+    session.items_version += 1
+    session.state_version += 1
+
+def _are_items_left(session: LootSession) -> bool:
+    """Return True if any item has not yet been assigned. O(1): unassigned_indices is kept in sync."""
+    return bool(session.unassigned_indices)
+
+def _advance_turn_snake(session: LootSession) -> None:
     """
     Advance the current_turn index using snake draft logic, respecting 'skipped' status.
     If the end is reached, reverse direction and increment the round.
     If no items remain or all users skipped, mark session complete.
     """
-    session["just_reversed"] = False
+    session.just_reversed = False
+    session.item_page = 0  # each picker starts on the first page of items
+    _mark_changed(session)
     if not _are_items_left(session):
-        session["current_turn"] = len(session["rolls"])
+        session.current_turn = len(session.rolls)
         return
 
-    rolls = session["rolls"]
+    rolls = session.rolls
     num = len(rolls)
     if num == 0:
         return
 
     # Check if anyone is active (not skipped)
-    if all(r.get("skipped") for r in rolls):
-        session["current_turn"] = num
+    if session.skipped_count >= num:
+        session.current_turn = num
         return
 
-    if session["current_turn"] == TURN_NOT_STARTED:
+    if session.current_turn == TURN_NOT_STARTED:
         # Start at the first non-skipped user
         for i in range(num):
-            if not rolls[i].get("skipped"):
-                session["current_turn"] = i
+            if not rolls[i].skipped:
+                session.current_turn = i
                 return
         # Fallback if everyone is skipped (caught by all() check above usually)
-        session["current_turn"] = num
+        session.current_turn = num
         return
 
-    curr = session["current_turn"]
-    direction = session["direction"]
+    curr = session.current_turn
+    direction = session.direction
     
     # We need to find the next active user. 
     # Simulate the snake walk until a non-skipped user is found or we exhaust reasonable attempts.
@@ -93,88 +296,144 @@ def _advance_turn_snake(session: dict) -> None:
         if 0 <= next_idx < num:
             curr = next_idx
             # If user is not skipped, they are the next turn
-            if not rolls[curr].get("skipped"):
-                session["current_turn"] = curr
-                session["direction"] = direction
+            if not rolls[curr].skipped:
+                session.current_turn = curr
+                session.direction = direction
                 return
             # If skipped, loop continues with updated curr in same direction
         else:
             # Reverse direction
             direction *= -1
-            session["round"] += 1
-            session["just_reversed"] = True
-            session["direction"] = direction
+            session.round += 1
+            session.just_reversed = True
+            session.direction = direction
             
             # In snake draft, hitting the edge often means the edge player goes again (or first in next round).
             # Check the edge player (curr) again with the new direction logic implications.
             # If the edge player is not skipped, they take the turn.
-            if not rolls[curr].get("skipped"):
-                session["current_turn"] = curr
+            if not rolls[curr].skipped:
+                session.current_turn = curr
                 return
             # If edge is skipped, next iteration will apply new direction from curr
             
     # If we fall through, assume done
-    session["current_turn"] = num
+    session.current_turn = num
 
-def _get_next_active_index(session: dict) -> int:
+def _get_next_active_index(session: LootSession) -> int:
     """
     Determine the index of the *next* player who will take a turn, without modifying session state.
     Returns -1 if no next player exists.
     """
     if not _are_items_left(session):
         return -1
-    rolls = session["rolls"]
+    rolls = session.rolls
     num = len(rolls)
     if num == 0:
         return -1
-    if session["current_turn"] < 0 or session["current_turn"] >= num:
+    if session.current_turn < 0 or session.current_turn >= num:
         return -1
 
-    curr = session["current_turn"]
-    direction = session["direction"]
+    curr = session.current_turn
+    direction = session.direction
     
     # Simulate one successful 'advance' step
     for _ in range(num * 4):
         next_idx = curr + direction
         if 0 <= next_idx < num:
             curr = next_idx
-            if not rolls[curr].get("skipped"):
+            if not rolls[curr].skipped:
                 return curr
         else:
             direction *= -1
-            if not rolls[curr].get("skipped"):
+            if not rolls[curr].skipped:
                 return curr
             
     return -1
 
-def _build_roll_lines(session: dict) -> str:
+def _item_view_signature(session: LootSession) -> tuple:
+    """
+    Everything the item-picker message is rendered from. Two renders with equal
+    signatures produce the same text and components, so the second edit can be skipped.
+    on_item_select relies on the selection being at index 3.
+    """
+    return (
+        session.current_turn,
+        session.just_reversed,
+        session.items_version,  # stands in for unassigned_indices without copying it
+        session.selected_items or frozenset(),
+        session.last_action is not None,
+        session.item_page,
+    )
+
+def _swap_view(session: LootSession, attr: str, view: nextcord.ui.View | None) -> None:
+    """
+    Record view as session.<attr>, stopping the view it replaces. nextcord never evicts
+    timeout=None views on its own, so a replaced view left running would stay in the
+    view store (and keep its session alive) for the life of the process.
+    """
+    old = getattr(session, attr)
+    if old is not None and old is not view:
+        old.stop()
+    setattr(session, attr, view)
+
+def _attached_item_view(session: LootSession, message_id: int | None, signature: tuple):
+    """
+    The ItemDropdownView already attached to message_id if its components match
+    signature (only the turn text differs), re-armed for the current state; else None.
+    """
+    view = session.item_view
+    render = session.last_item_render
+    if view is not None and render and render[0] == message_id and render[1][2:] == signature[2:]:
+        view.built_for = (session.current_turn, session.state_version)
+        return view
+    return None
+
+def _control_view_signature(session: LootSession) -> tuple:
+    """
+    Everything ControlPanelView is built from. Once the draft has started the panel
+    has no components, so the signature stays constant and the view need not be re-sent.
+    """
+    if session.current_turn != TURN_NOT_STARTED:
+        return (True,)
+    return (False, tuple(r.member_id for r in session.rolls), session.members_to_remove or frozenset())
+
+def _roll_rows(session: LootSession) -> list[str]:
+    """
+    Roll-order rows (position emoji, name, roll and tie-break where needed) without
+    the turn status. They only depend on the roll order, so they are built once and
+    rebuilt only after participants are removed (which resets session.roll_rows).
+    """
+    rows = session.roll_rows
+    if rows is None:
+        rolls = session.rolls
+        # Tally in C (map + attrgetter + Counter) rather than a Python-level pass.
+        roll_counts = Counter(map(attrgetter("roll"), rolls))
+        number_emoji = NUMBER_EMOJIS.get
+        rows = session.roll_rows = [
+            f"{number_emoji(idx + 1) or f'#{idx+1}'} {BLUE}{r.name}{RESET} ({r.roll})"
+            + (f" /TB:{r.tiebreak}" if roll_counts[r.roll] > 1 else "")
+            for idx, r in enumerate(rolls)
+        ]
+    return rows
+
+def _build_roll_lines(session: LootSession) -> str:
     """
     Build the text block that shows roll order, tie-breaks, and status emojis.
     Returns a newline-separated string suitable for insertion into an ANSI code block.
     """
-    rolls = session["rolls"]
-    roll_counts = {}
-    for r in rolls:
-        roll_counts.setdefault(r["roll"], 0)
-        roll_counts[r["roll"]] += 1
-    
-    current_idx = session["current_turn"]
+    rolls = session.rolls
+    rows = _roll_rows(session)
+
+    current_idx = session.current_turn
     # Only calculate next if session is active
     is_active = (0 <= current_idx < len(rolls)) and _are_items_left(session)
     next_idx = _get_next_active_index(session) if is_active else -1
     
     parts = []
     for idx, r in enumerate(rolls):
-        emoji = NUMBER_EMOJIS.get(idx + 1, f"#{idx+1}")
-        name = r["member"].display_name
-        base = f"{emoji} {BLUE}{name}{RESET} ({r['roll']})"
-        if roll_counts.get(r["roll"], 0) > 1:
-            tb = r.get("tiebreak")
-            base += f" /TB:{tb if tb is not None else '—'}"
-        
         # Add status emoji
         status = ""
-        if r.get("skipped"):
+        if r.skipped:
             # User has opted out of remaining loot.
             # No specific emoji requested for skipped, but we shouldn't show active ones.
             # We can leave blank or add a symbol. Let's leave blank to avoid clutter, or use a distinctive one.
@@ -187,7 +446,7 @@ def _build_roll_lines(session: dict) -> str:
             else:
                 status = " ⏳"
         
-        parts.append(base + status)
+        parts.append(f"{rows[idx]}{status}")
     return "\n".join(parts)
 
 async def _get_msg(channel: nextcord.abc.GuildChannel | nextcord.TextChannel | None, msg_id: int):
@@ -212,187 +471,240 @@ async def _get_msg(channel: nextcord.abc.GuildChannel | nextcord.TextChannel | N
         pass
     return None
 
+async def _ignore(coro):
+    """Await coro and swallow any exception (best-effort Discord calls). Returns the result or None."""
+    try:
+        return await coro
+    except Exception:
+        return None
+
+async def _edit_msg(channel, msg_id: int | None, **fields) -> None:
+    """Edit the message with msg_id in channel, if it can be resolved."""
+    msg = await _get_msg(channel, msg_id)
+    if msg:
+        await msg.edit(**fields)
+
+async def _delete_msg(channel, msg_id: int | None) -> None:
+    """Delete the message with msg_id in channel, if it can be resolved."""
+    msg = await _get_msg(channel, msg_id)
+    if msg:
+        await msg.delete()
+
+async def _session_msg(session: LootSession, channel, attr: str, msg_id: int | None):
+    """
+    Return the message object cached on session.<attr>, resolving and caching it
+    with _get_msg the first time (or after it was invalidated by setting it to None).
+    """
+    msg = getattr(session, attr)
+    if msg is None:
+        msg = await _get_msg(channel, msg_id)
+        setattr(session, attr, msg)
+    return msg
+
+async def _current_item_msg(session: LootSession, channel, msg_id: int | None):
+    """
+    Return the item message the bot last sent if it is still the current one
+    (msg_id), otherwise resolve msg_id with _get_msg.
+    """
+    msg = session.item_msg
+    if msg is not None and msg_id and msg.id == msg_id:
+        return msg
+    return await _get_msg(channel, msg_id)
+
+async def _noop() -> None:
+    """Awaitable placeholder for an edit that doesn't need to happen (keeps gather() positions stable)."""
+    return None
+
 # ---------- Message builders (use ANSI for colored output) ----------
-def build_loot_list_message(session: dict) -> str:
+def _unassigned_text(session: LootSession) -> str:
+    """
+    The pre-rendered loot lines of the unassigned items, joined once per items_version.
+    Shared by the loot list ('Remaining') and the final summary ('Unclaimed').
+    """
+    cached = session.cached_unassigned
+    if cached and cached[0] == session.items_version:
+        return cached[1]
+    text = "".join(map(session.loot_lines.__getitem__, session.unassigned_indices))
+    session.cached_unassigned = (session.items_version, text)
+    return text
+
+def build_loot_list_message(session: LootSession) -> str:
     """
     Build the left-hand 'loot list' message (1/2).
     Shows remaining items or a completion block.
     """
     header = f"**(1/2)**\n"
-    remaining = [it for it in session["items"] if it["assigned_to"] is None]
-    if remaining:
-        body = (
-            "```ansi\n"
-            f"{RED}{BOLD}❌ Remaining Loot Items ❌{RESET}\n"
-            "==================================\n"
-        )
-        for it in remaining:
-            body += f"{RED}{it['display_number']}.{RESET} {it['name']}\n"
-        body += "```"
-        return f"{header}{body}"
-    return (
-        f"{header}"
-        "```ansi\n"
-        f"{GREEN}{BOLD}✅ All Items Assigned ✅{RESET}\n"
-        "==================================\n"
-        "All items have been distributed.\n"
-        "```"
-    )
+    if session.unassigned_indices:
+        return f"{header}{HEADER_REMAINING}{_unassigned_text(session)}```"
+    return f"{header}{HEADER_ALL_ASSIGNED}All items have been distributed.\n```"
 
-def build_last_assigned_message(session: dict) -> str:
+def build_last_assigned_message(session: LootSession) -> str:
     """
     Build a 'Last Assigned Loot Items' view showing the items that were
-    assigned in the most recent action (session['last_action']['assigned_indices']).
+    assigned in the most recent action (session.last_action['assigned_indices']).
     Falls back to the normal loot list if no snapshot is available.
     """
-    header = f"**(1/2)**\n"
-    last = session.get("last_action") or {}
+    last = session.last_action or {}
     indices = last.get("assigned_indices") or []
     if not indices:
         # Nothing to show; fall back to the usual loot list (should be all assigned)
         return build_loot_list_message(session)
 
-    body = (
-        "```ansi\n"
-        f"{MAGENTA}{BOLD}📝 Last Assigned Loot Items 📝{RESET}\n"
-        "==================================\n"
-    )
+    items = session.items
+    parts = ["**(1/2)**\n", HEADER_LAST_ASSIGNED]
     for idx in indices:
-        if 0 <= idx < len(session["items"]):
-            it = session["items"][idx]
-            body += f"{MAGENTA}{it['display_number']}.{RESET} {it['name']}\n"
-    body += "```"
-    return f"{header}{body}"
+        if 0 <= idx < len(items):
+            it = items[idx]
+            parts.append(f"{MAGENTA}{it.display_number}.{RESET} {it.name}\n")
+    parts.append("```")
+    return "".join(parts)
+
+def _owner_rows(session: LootSession) -> list[str]:
+    """Per-roller heading lines of the 'Assigned Items' block, built once per roll order like _roll_rows."""
+    rows = session.owner_rows
+    if rows is None:
+        number_emoji = NUMBER_EMOJIS.get
+        rows = session.owner_rows = [
+            f"{BLUE}{number_emoji(i + 1) or f'#{i+1}'} {r.name}{RESET}\n"
+            for i, r in enumerate(session.rolls)
+        ]
+    return rows
+
+def _build_assigned_block(session: LootSession) -> str:
+    """
+    Build the 'Assigned Items' code block shared by the control panel and the final summary:
+    each roller followed by their items in assignment order, with a blank line after each person.
+    Pieces are collected in a list and joined once rather than grown with +=.
+    """
+    # assigned_by_owner is maintained by assign/undo in assignment order, so each
+    # person's items are read straight off it without regrouping anything here.
+    lines = session.assigned_lines
+    by_owner = session.assigned_by_owner
+
+    parts = [HEADER_ASSIGNED]
+    for heading, r in zip(_owner_rows(session), session.rolls):
+        parts.append(heading)
+        owned = by_owner.get(r.member_id)
+        if owned:
+            parts.extend(map(lines.__getitem__, owned))
+        else:
+            parts.append("- N/A\n")
+        parts.append("\n")
+    parts.append("```")
+    return "".join(parts)
 
-def build_control_panel_message(session: dict) -> str:
+def _roster_blocks(session: LootSession) -> str:
+    """
+    The roll order and assigned items blocks shared by the control panel and the final
+    summary, memoized per state_version: expiry-only panel updates and the summary built
+    right after the last panel render reuse it.
+    """
+    cached = session.cached_roster
+    if cached and cached[0] == session.state_version:
+        return cached[1]
+    content = f"{HEADER_ROLL_ORDER}{_build_roll_lines(session)}\n```\n{_build_assigned_block(session)}"
+    session.cached_roster = (session.state_version, content)
+    return content
+
+def build_control_panel_message(session: LootSession) -> str:
     """
     Build the control panel message (2/2) containing roll order + assigned items
     and a short indicator about current round/direction or readiness.
     """
-    header = f"**(2/2)**\n\n✍️ **Loot Manager:** {session['invoker'].mention}\n\n"
-    roll_block = (
-        "```ansi\n"
-        f"{YELLOW}{BOLD}🎲 Roll Order 🎲{RESET}\n"
-        "==================================\n"
-        f"{_build_roll_lines(session)}\n"
-        "```"
-    )
-
-    # Collect assigned items and sort them by the order they were assigned
-    # This ensures new items added to a person's list appear at the end.
-    assigned_items = [it for it in session["items"] if it["assigned_to"]]
-    assigned_items.sort(key=lambda x: x.get("assigned_order", 0))
-
-    # Map member id -> list of assigned item names for display
-    assigned_map = {r["member"].id: [] for r in session["rolls"]}
-    for it in assigned_items:
-        assigned_map.setdefault(it["assigned_to"], []).append(it["name"])
-
-    assigned_block = (
-        "```ansi\n"
-        f"{GREEN}{BOLD}✅ Assigned Items ✅{RESET}\n"
-        "==================================\n"
-    )
-    # Show each roller and their assigned items. Add a blank line after each person
-    for i, r in enumerate(session["rolls"]):
-        emoji = NUMBER_EMOJIS.get(i + 1, f"#{i+1}")
-        assigned_block += f"{BLUE}{emoji} {r['member'].display_name}{RESET}\n"
-        items = assigned_map.get(r["member"].id, [])
-        if items:
-            for nm in items:
-                assigned_block += f"- {nm}\n"
-        else:
-            assigned_block += "- N/A\n"
-        assigned_block += "\n"
-    assigned_block += "```"
-
-    indicator = ""
-    if 0 <= session["current_turn"] < len(session["rolls"]):
-        direction = "Normal" if session["direction"] == 1 else "Reverse"
-        indicator = f"\n🔔 **Round {session['round'] + 1}** ({direction})\n\n"
+    if 0 <= session.current_turn < len(session.rolls):
+        direction = "Normal" if session.direction == 1 else "Reverse"
+        indicator = f"\n🔔 **Round {session.round + 1}** ({direction})\n\n"
     else:
-        indicator = f"\n🎁 **Loot distribution is ready!**\n\n✍️ **Loot Manager can remove participants or click below to begin.**"
+        indicator = INDICATOR_READY
     # Append expiry timer (Discord unix timestamp) if available
-    expires = session.get("expires_at")
+    expiry = ""
+    expires = session.expires_at
     if expires:
         try:
-            ts = int(expires)
-            indicator += f"\n⏳ Expires: <t:{ts}:R>\n"
+            expiry = f"\n⏳ Expires: <t:{int(expires)}:R>\n"
         except Exception:
             pass
-    return f"{header}{roll_block}\n{assigned_block}{indicator}"
+    return f"{session.control_header}{_roster_blocks(session)}{indicator}{expiry}"
 
-def build_final_summary_message(session: dict, timed_out: bool=False) -> str:
+def _cached_loot_list(session: LootSession) -> str:
+    """
+    Return build_loot_list_message(session), rebuilding only when the unassigned items
+    have changed: turn changes (skips, snake reversals) reuse the cached list.
+    """
+    cached = session.cached_loot
+    if cached and cached[0] == session.items_version:
+        return cached[1]
+    content = build_loot_list_message(session)
+    session.cached_loot = (session.items_version, content)
+    return content
+
+def _cached_control_panel(session: LootSession) -> str:
+    """Return build_control_panel_message(session), rebuilding only when the session or expiry has changed."""
+    key = (session.state_version, session.expires_at)
+    cached = session.cached_control
+    if cached and cached[0] == key:
+        return cached[1]
+    content = build_control_panel_message(session)
+    session.cached_control = (key, content)
+    return content
+
+def build_final_summary_message(session: LootSession, timed_out: bool=False) -> str:
     """
     Build final summary that is shown either when timed out or all items assigned.
     Includes roll order, final assigned lists, and any unclaimed items.
     """
-    header = ("⌛ **The loot session has timed out!**\n\n" if timed_out 
-              else "✅ **All items have been assigned!**\n\n")
-    roll_block = (
-        "```ansi\n"
-        f"{YELLOW}{BOLD}🎲 Roll Order 🎲{RESET}\n"
-        "==================================\n"
-        f"{_build_roll_lines(session)}\n"
-        "```"
-    )
+    header = SUMMARY_HEADER_TIMED_OUT if timed_out else SUMMARY_HEADER_DONE
 
-    # Sort items by assignment order
-    assigned_items = [it for it in session["items"] if it["assigned_to"]]
-    assigned_items.sort(key=lambda x: x.get("assigned_order", 0))
-
-    assigned_map = {r["member"].id: [] for r in session["rolls"]}
-    for it in assigned_items:
-        assigned_map.setdefault(it["assigned_to"], []).append(it["name"])
-
-    assigned_block = (
-        "```ansi\n"
-        f"{GREEN}{BOLD}✅ Assigned Items ✅{RESET}\n"
-        "==================================\n"
-    )
-    # same formatting as control panel; blank line after each person's items for readability
-    for i, r in enumerate(session["rolls"]):
-        emoji = NUMBER_EMOJIS.get(i + 1, f"#{i+1}")
-        assigned_block += f"{BLUE}{emoji} {r['member'].display_name}{RESET}\n"
-        items = assigned_map.get(r["member"].id, [])
-        if items:
-            for nm in items:
-                assigned_block += f"- {nm}\n"
-        else:
-            assigned_block += "- N/A\n"
-        assigned_block += "\n"
-    assigned_block += "```"
-
-    unclaimed = [it for it in session["items"] if it["assigned_to"] is None]
     unclaimed_block = ""
-    if unclaimed:
-        unclaimed_block = (
-            "```ansi\n"
-            f"{RED}{BOLD}❌ Unclaimed Items ❌{RESET}\n"
-            "==================================\n"
-        )
-        for it in unclaimed:
-            unclaimed_block += f"{RED}{it['display_number']}.{RESET} {it['name']}\n"
-        unclaimed_block += "```"
-    return f"{header}{roll_block}\n{assigned_block}\n{unclaimed_block}"
+    if session.unassigned_indices:
+        unclaimed_block = f"{HEADER_UNCLAIMED}{_unassigned_text(session)}```"
+    # same roll order and assigned blocks as the control panel
+    return f"{header}{_roster_blocks(session)}\n{unclaimed_block}"
 
-def _item_message_text_and_active(session: dict) -> tuple[str, bool]:
+def _item_message_text_and_active(session: LootSession) -> tuple[str, bool]:
     """
     Returns tuple (message_text, is_active) for the 'item picker' message.
     is_active True means a picker should see a dropdown view created.
     """
-    if not _are_items_left(session) or session["current_turn"] == TURN_NOT_STARTED:
+    if not _are_items_left(session) or session.current_turn == TURN_NOT_STARTED:
         return ("No active picks right now.", False)
-    if not (0 <= session["current_turn"] < len(session["rolls"])):
+    if not (0 <= session.current_turn < len(session.rolls)):
         return ("No active picks right now.", False)
-    picker = session["rolls"][session["current_turn"]]["member"]
-    emoji = NUMBER_EMOJIS.get(session["current_turn"] + 1, "👉")
-    turn_text = "turn!" if not session.get("just_reversed", False) else "turn (direction reversed)!"
-    return (f"**{emoji} {picker.mention}'s {turn_text}**\n\nChoose item(s) below:", True)
+    return (_item_turn_text(session), True)
+
+def _item_turn_text(session: LootSession) -> str:
+    """
+    Text of the item-picker message for the current turn, memoized per
+    (current_turn, just_reversed). The cache is cleared when the roll order changes.
+    """
+    key = (session.current_turn, session.just_reversed)
+    text = session.item_text_cache.get(key)
+    if text is None:
+        mention = session.rolls[session.current_turn].mention
+        emoji = NUMBER_EMOJIS.get(session.current_turn + 1, "👉")
+        turn_text = "turn!" if not session.just_reversed else "turn (direction reversed)!"
+        text = f"**{emoji} {mention}'s {turn_text}**\n\nChoose item(s) below:"
+        session.item_text_cache[key] = text
+    return text
 
 # ---------- UI Views: Item dropdown view, Add Item Modal, and Control panel view ----------
 
-class AddItemModal(nextcord.ui.Modal):
+class _SessionBound:
+    """
+    Mixin for views/modals bound to one session: self.session looks the LootSession up
+    by id on each access and is None once the session has ended. The view holds no
+    reference to it, so a view nextcord still keeps can't keep a finished session alive.
+    """
+    session_id: int
+
+    @property
+    def session(self) -> LootSession | None:
+        s = loot_sessions.get(self.session_id)
+        if s is None or s.ended:
+            return None
+        return s
+
+class AddItemModal(_SessionBound, nextcord.ui.Modal):
     """
     Modal for the Loot Master to add a new item dynamically during distribution.
     """
@@ -409,52 +721,34 @@ class AddItemModal(nextcord.ui.Modal):
         self.add_item(self.item_input)
 
     async def callback(self, interaction: nextcord.Interaction):
-        session = loot_sessions.get(self.session_id)
+        session = self.session
         if not session:
-            await interaction.response.send_message("Session expired.", ephemeral=True)
+            await interaction.response.send_message(MSG_SESSION_EXPIRED, ephemeral=True)
             return
 
         # Parse input
-        s = self.item_input.value.strip()
-        names = []
-        if s:
-            m = re.match(r"(\d+)[xX]\s*(.*)", s)
-            if m:
-                try:
-                    c = int(m.group(1))
-                    nm = m.group(2).strip()
-                    if nm:
-                        names.extend([nm] * c)
-                    else:
-                        names.append(s)
-                except Exception:
-                    names.append(s)
-            else:
-                names.append(s)
-        
+        names = _parse_item_names(self.item_input.value)
+
         if not names:
             await interaction.response.send_message("Invalid item name.", ephemeral=True)
             return
 
-        # Determine next display number
-        current_max = 0
-        for it in session["items"]:
-            try:
-                if it["display_number"] > current_max:
-                    current_max = it["display_number"]
-            except:
-                pass
+        async with session.lock:
+            # Display numbers are 1-based positions in session.items (items are only
+            # ever appended), so the next one follows from the length without a scan.
+            start = len(session.items)
+            new_items = [LootItem(n, start + i + 1) for i, n in enumerate(names)]
+            session.items.extend(new_items)
+            _render_new_items(session, start)
+            _mark_items_changed(session)
         
-        new_items = [{"name": n, "assigned_to": None, "display_number": current_max + i + 1} for i, n in enumerate(names)]
-        session["items"].extend(new_items)
-        
-        await _reset_session_timeout(self.session_id)
+        _reset_session_timeout(self.session_id)
         # We need to refresh the views. 
         # Sending a response is required to close the modal cleanly.
         await interaction.response.defer(ephemeral=True)
         _schedule_refresh(self.session_id, delete_item=True)
 
-class ItemDropdownView(nextcord.ui.View):
+class ItemDropdownView(_SessionBound, nextcord.ui.View):
     """
     Dropdown view that shows all currently available items for the active picker.
     Supports multi-chunk selects (25 options per select) and buttons for assign/skip/undo.
@@ -462,6 +756,7 @@ class ItemDropdownView(nextcord.ui.View):
     def __init__(self, session_id: int):
         super().__init__(timeout=None)
         self.session_id = session_id
+        self.built_for = None  # (current_turn, state_version) this view was rendered for
         self._populate()
 
     def _populate(self):
@@ -470,45 +765,53 @@ class ItemDropdownView(nextcord.ui.View):
         Fixes the '25+ items' crash by dynamically assigning Action Rows.
         """
         self.clear_items()
-        session = loot_sessions.get(self.session_id)
+        session = self.session
         if not session:
             return
-        if not _are_items_left(session):
-            return
-        if not (0 <= session["current_turn"] < len(session["rolls"])):
-            return
-
-        available = [(i, it) for i, it in enumerate(session["items"]) if it["assigned_to"] is None]
+        self.built_for = (session.current_turn, session.state_version)
+        # unassigned_indices is the maintained available-items partition: it drives
+        # both the "anything left" check and the options, with no pass over items.
+        available = session.unassigned_indices
         if not available:
             return
+        if not (0 <= session.current_turn < len(session.rolls)):
+            return
 
         # 1. Add Dropdowns (1 row per dropdown)
         chunks = [available[i:i+25] for i in range(0, len(available), 25)]
-        selected = set(session.get("selected_items") or [])
+        selected = session.selected_items or frozenset()
         
-        # Safety: Discord only allows 5 rows. We need 2 for buttons, so max 3 for dropdowns.
-        dropdown_count = min(len(chunks), 3) 
+        # Safety: Discord only allows 5 rows. We need 2 for buttons, so max 3 for dropdowns;
+        # longer lists are shown a page (of up to 3 selects) at a time.
+        page_count = -(-len(available) // ITEMS_PER_PAGE)
+        page = session.item_page % page_count
+        first = page * 3
+        dropdown_count = min(len(chunks) - first, 3)
         
-        for ci in range(dropdown_count):
+        cached = session.select_options
+        for row in range(dropdown_count):
+            ci = first + row  # absolute chunk index, so on_item_select can slice its items directly
             chunk = chunks[ci]
-            opts = []
-            for idx, item in chunk:
-                label = f"{item['display_number']}. {item['name']}"
-                truncated = (label[:97] + "...") if len(label) > 100 else label
-                is_selected = str(idx) in selected
-                opts.append(nextcord.SelectOption(label=truncated, value=str(idx), default=is_selected))
-            
-            placeholder = "Choose item(s)..." if dropdown_count == 1 else f"Items {chunk[0][1]['display_number']} - {chunk[-1][1]['display_number']}"
+            opts = [
+                nextcord.SelectOption(label=cached[idx].label, value=cached[idx].value, default=True) if idx in selected else cached[idx]
+                for idx in chunk
+            ]
+
+            # Display numbers are 1-based item positions, so they follow from the indices.
+            placeholder = "Choose item(s)..." if len(chunks) == 1 else f"Items {chunk[0] + 1} - {chunk[-1] + 1}"
             
             # Dropdowns are added to Rows 0, 1, etc.
-            self.add_item(nextcord.ui.Select(
+            select = nextcord.ui.Select(
                 placeholder=placeholder, 
                 options=opts, 
                 custom_id=f"item_select_{ci}", 
                 min_values=0, 
                 max_values=len(opts),
-                row=ci
-            ))
+                row=row
+            )
+            # Bind the chunk index so the callback doesn't have to parse it back out of custom_id
+            select.callback = functools.partial(self.on_item_select, ci)
+            self.add_item(select)
 
         # 2. Dynamic Button Positioning
         # Start buttons on the row immediately following the last dropdown
@@ -516,243 +819,280 @@ class ItemDropdownView(nextcord.ui.View):
         btn_row_2 = dropdown_count + 1
 
         # Row 1 Buttons: Assign, Skip, Skip Remaining
-        assign_disabled = not session.get("selected_items")
-        self.add_item(nextcord.ui.Button(label="Assign Selected", style=nextcord.ButtonStyle.success, emoji="✅", custom_id="assign_button", disabled=assign_disabled, row=btn_row_1))
-        self.add_item(nextcord.ui.Button(label="Skip Turn", style=nextcord.ButtonStyle.danger, custom_id="skip_button", row=btn_row_1))
-        self.add_item(nextcord.ui.Button(label="Skip Remaining", style=nextcord.ButtonStyle.danger, custom_id="skip_remaining_button", row=btn_row_1))
+        assign_disabled = not session.selected_items
+        self.add_item(_button(self.on_assign, label="Assign Selected", style=nextcord.ButtonStyle.success, emoji="✅", custom_id="assign_button", disabled=assign_disabled, row=btn_row_1))
+        self.add_item(_button(self.on_skip, label="Skip Turn", style=nextcord.ButtonStyle.danger, custom_id="skip_button", row=btn_row_1))
+        self.add_item(_button(self.on_skip_remaining, label="Skip Remaining", style=nextcord.ButtonStyle.danger, custom_id="skip_remaining_button", row=btn_row_1))
         
         # Row 2 Buttons: Undo, Add Item
-        undo_disabled = not session.get("last_action")
-        self.add_item(nextcord.ui.Button(label="Undo", style=nextcord.ButtonStyle.secondary, emoji="↩️", custom_id="undo_button", disabled=undo_disabled, row=btn_row_2))
-        self.add_item(nextcord.ui.Button(label="Add Item", style=nextcord.ButtonStyle.primary, emoji="➕", custom_id="add_item_button", row=btn_row_2))
-
-        # 3. Wire Callbacks
-        for child in self.children:
-            if isinstance(child, nextcord.ui.Button):
-                if child.custom_id == "assign_button": child.callback = self.on_assign
-                elif child.custom_id == "skip_button": child.callback = self.on_skip
-                elif child.custom_id == "skip_remaining_button": child.callback = self.on_skip_remaining
-                elif child.custom_id == "undo_button": child.callback = self.on_undo
-                elif child.custom_id == "add_item_button": child.callback = self.on_add_item
-            elif isinstance(child, nextcord.ui.Select):
-                child.callback = self.on_item_select
-                
-    async def _fast_edit(self, interaction: nextcord.Interaction, content: str, view: nextcord.ui.View | None) -> bool:
+        undo_disabled = not session.last_action
+        self.add_item(_button(self.on_undo, label="Undo", style=nextcord.ButtonStyle.secondary, emoji="↩️", custom_id="undo_button", disabled=undo_disabled, row=btn_row_2))
+        self.add_item(_button(self.on_add_item, label="Add Item", style=nextcord.ButtonStyle.primary, emoji="➕", custom_id="add_item_button", row=btn_row_2))
+        if page_count > 1:
+            self.add_item(_button(self.on_next_page, label=f"Next Page ({page + 1}/{page_count})", style=nextcord.ButtonStyle.primary, custom_id="page_button", row=btn_row_2))
+
+    async def _fast_edit(self, interaction: nextcord.Interaction, content: str, active: bool) -> bool:
         """
         Attempt quick edit via interaction.response.edit_message; fallback to fetching & editing
         the stored item-dropdown message id, or send a new message if needed.
+        When active, the attached ItemDropdownView is kept if its components are unchanged;
+        otherwise a fresh one is built, only once an edit will happen.
         """
-        session = loot_sessions.get(self.session_id)
+        session = self.session
         if not session:
+            await _ignore(interaction.response.send_message(MSG_SESSION_EXPIRED, ephemeral=True))
+            return False
+
+        # Skip the edit entirely if the item message already shows this exact state.
+        message_id = getattr(interaction.message, "id", None)
+        signature = _item_view_signature(session)
+        if message_id and message_id == session.item_dropdown_message_id and session.last_item_render == (message_id, signature):
+            # The shown view stays current: re-arm it, or a turn that kept the same
+            # signature (e.g. a lone roller skipping) would be rejected as stale.
+            if session.item_view is not None:
+                session.item_view.built_for = (session.current_turn, session.state_version)
             try:
-                await interaction.response.send_message("Session expired.", ephemeral=True)
-            except Exception:
+                await interaction.response.defer()
+            except (nextcord.InteractionResponded, nextcord.HTTPException):
                 pass
-            return False
+            return True
 
+        view = _attached_item_view(session, message_id, signature) if active else None
+        if view is not None:
+            # Same components as already shown: send the new text only.
+            edit = interaction.response.edit_message(content=content)
+        else:
+            view = ItemDropdownView(self.session_id) if active else None
+            edit = interaction.response.edit_message(content=content, view=view)
         try:
-            await interaction.response.edit_message(content=content, view=view)
+            await edit
+            if message_id and message_id == session.item_dropdown_message_id:
+                session.last_item_render = (message_id, signature)
+                _swap_view(session, "item_view", view)
+            if view is not self:
+                # This message's components now belong to the new view (or are gone).
+                self.stop()
             return True
-        except Exception:
+        except nextcord.InteractionResponded:
+            # Already acknowledged: deferring again would just raise, so go straight
+            # to editing the stored item-dropdown message.
+            pass
+        except nextcord.HTTPException:
             try:
                 await interaction.response.defer()
-            except Exception:
-                try:
-                    await interaction.response.send_message("Processing...", ephemeral=True)
-                except Exception:
-                    pass
-
-            ch = bot.get_channel(session["channel_id"])
-            if not ch:
-                return False
-            existing_id = session.get("item_dropdown_message_id")
-            if existing_id:
-                try:
-                    msg = await _get_msg(ch, existing_id)
-                    if msg:
-                        await msg.edit(content=content, view=view)
-                        return True
-                except Exception:
-                    pass
+            except (nextcord.InteractionResponded, nextcord.HTTPException):
+                pass
+
+        ch = bot.get_channel(session.channel_id)
+        if not ch:
+            return False
+        existing_id = session.item_dropdown_message_id
+        if existing_id:
             try:
-                msg = await ch.send(content, view=view)
-                session["item_dropdown_message_id"] = msg.id
-                return True
-            except Exception:
-                return False
+                msg = await _current_item_msg(session, ch, existing_id)
+                if msg:
+                    await msg.edit(content=content, view=view)
+                    _swap_view(session, "item_view", view)
+                    return True
+            except nextcord.HTTPException:
+                pass
+        try:
+            msg = await ch.send(content, view=view)
+            _swap_view(session, "item_view", view)
+            session.item_dropdown_message_id = msg.id
+            session.item_msg = msg
+            return True
+        except nextcord.HTTPException:
+            return False
+
+    def _is_stale(self, session: LootSession) -> bool:
+        """True if the draft has moved on since this view was rendered (e.g. a double click)."""
+        return self.built_for != (session.current_turn, session.state_version)
+
+    async def _reject_stale(self, interaction: nextcord.Interaction):
+        try:
+            await interaction.response.send_message(MSG_STALE_VIEW, ephemeral=True)
+        except (nextcord.InteractionResponded, nextcord.HTTPException):
+            pass
 
     async def _ack(self, interaction: nextcord.Interaction):
         """Helper to acknowledge interactions gracefully."""
         try:
             await interaction.response.defer()
-        except Exception:
+        except nextcord.InteractionResponded:
+            pass
+        except nextcord.HTTPException:
             try:
-                await interaction.response.defer(ephemeral=True)
-            except Exception:
-                try:
-                    await interaction.response.send_message("Processing...", ephemeral=True)
-                except Exception:
-                    pass
+                await interaction.response.send_message("Processing...", ephemeral=True)
+            except (nextcord.InteractionResponded, nextcord.HTTPException):
+                pass
 
-    async def on_item_select(self, interaction: nextcord.Interaction):
+    async def on_item_select(self, idx: int, interaction: nextcord.Interaction):
         """
-        When user (re)selects items, persist selections into session['selected_items'].
+        When user (re)selects items, persist selections into session.selected_items.
         Uses set arithmetic to keep selections across chunked selects.
+        idx is the chunk index, bound per Select in _populate.
         """
-        session = loot_sessions.get(self.session_id)
+        session = self.session
         if not session:
             await self._ack(interaction)
-            try:
-                await interaction.followup.send("Session expired.", ephemeral=True)
-            except Exception:
-                pass
+            await _ignore(interaction.followup.send(MSG_SESSION_EXPIRED, ephemeral=True))
             return
 
-        cid = interaction.data.get("custom_id")
-        if not cid:
-            await self._ack(interaction)
-            try:
-                await interaction.followup.send("Invalid selection.", ephemeral=True)
-            except Exception:
-                pass
-            return
-        try:
-            idx = int(cid.split("_")[-1])
-        except Exception:
+        # Only this select's 25-item slice of the available indices is needed.
+        chunk = session.unassigned_indices[idx * 25:(idx + 1) * 25]
+        if not chunk:
             await self._ack(interaction)
-            try:
-                await interaction.followup.send("Malformed dropdown id.", ephemeral=True)
-            except Exception:
-                pass
+            await _ignore(interaction.followup.send("Stale dropdown.", ephemeral=True))
             return
 
-        available = [(i, it) for i, it in enumerate(session["items"]) if it["assigned_to"] is None]
-        chunks = [available[i:i+25] for i in range(0, len(available), 25)]
-        if idx >= len(chunks):
-            await self._ack(interaction)
-            try:
-                await interaction.followup.send("Stale dropdown.", ephemeral=True)
-            except Exception:
-                pass
+        # Parse the option values into item indices once, here, so on_assign works on ints.
+        possible = set(chunk)
+        newly = {int(v) for v in interaction.data.get("values", []) if v.isdigit()} & possible
+        async with session.lock:
+            # remove any selections from this chunk (they are replaced by the new ones)
+            session.selected_items = ((session.selected_items or frozenset()) - possible) | newly
+            # The picker's client already shows their choice in the select, and the only other
+            # component that depends on it is the Assign button. So skip the re-render while
+            # the message is otherwise current and Assign's enabled state wouldn't change.
+            # last_item_render keeps the selection actually sent: other viewers see that one
+            # until the next render, which (its signature differing) rebuilds the defaults.
+            render = session.last_item_render
+            signature = _item_view_signature(session)
+            quiet = (
+                render is not None
+                and render[0] == session.item_dropdown_message_id
+                and render[1][:3] == signature[:3] and render[1][4:] == signature[4:]
+                and bool(render[1][3]) == bool(signature[3])
+            )
+
+        await self._ack(interaction)
+        _reset_session_timeout(self.session_id)
+        if not quiet:
+            # refresh messages without forcing item deletion (preserve dropdown when possible)
+            _schedule_refresh(self.session_id, delete_item=False)
+
+    async def on_next_page(self, interaction: nextcord.Interaction):
+        """Show the next page of item selects (only offered when more than ITEMS_PER_PAGE items are left)."""
+        session = self.session
+        if not session:
+            await _ignore(interaction.response.send_message(MSG_SESSION_EXPIRED, ephemeral=True))
             return
 
-        possible = {str(i) for i, _ in chunks[idx]}
-        newly = set(interaction.data.get("values", []))
-        lock = session_locks.setdefault(self.session_id, asyncio.Lock())
-        async with lock:
-            current = set(session.get("selected_items") or [])
-            # remove any selections from this chunk (they will be replaced by new)
-            current -= possible
-            current |= newly
-            session["selected_items"] = list(current)
+        async with session.lock:
+            page_count = -(-len(session.unassigned_indices) // ITEMS_PER_PAGE) or 1
+            session.item_page = (session.item_page + 1) % page_count
 
-        await self._ack(interaction)
-        await _reset_session_timeout(self.session_id)
-        # refresh messages without forcing item deletion (preserve dropdown when possible)
-        _schedule_refresh(self.session_id, delete_item=False)
+        new_text, active = _item_message_text_and_active(session)
+        await self._fast_edit(interaction, new_text, active)
+        _reset_session_timeout(self.session_id)
 
     async def on_assign(self, interaction: nextcord.Interaction):
         """
         Assign selected items to the current picker (or allow invoker to assign).
-        Records an undo snapshot in session['last_action'].
+        Records an undo snapshot in session.last_action.
         """
-        session = loot_sessions.get(self.session_id)
+        session = self.session
         if not session:
-            try:
-                await interaction.response.send_message("Session expired.", ephemeral=True)
-            except Exception:
-                pass
+            await _ignore(interaction.response.send_message(MSG_SESSION_EXPIRED, ephemeral=True))
             return
 
-        if session["current_turn"] < 0 or session["current_turn"] >= len(session["rolls"]):
-            try:
-                await interaction.response.send_message("It's not an active picking turn.", ephemeral=True)
-            except Exception:
-                pass
+        if session.current_turn < 0 or session.current_turn >= len(session.rolls):
+            await _ignore(interaction.response.send_message("It's not an active picking turn.", ephemeral=True))
             return
 
-        picker = session["rolls"][session["current_turn"]]["member"]
-        if interaction.user.id not in (picker.id, session["invoker_id"]):
-            try:
-                await interaction.response.send_message("🛡️ Only the current picker or the Loot Manager can assign items.", ephemeral=True)
-            except Exception:
-                pass
+        picker_id = session.rolls[session.current_turn].member_id
+        if interaction.user.id not in (picker_id, session.invoker_id):
+            await _ignore(interaction.response.send_message("🛡️ Only the current picker or the Loot Manager can assign items.", ephemeral=True))
             return
 
-        selected = session.get("selected_items") or []
-        session["last_action"] = {
-            "turn": session["current_turn"],
-            "round": session["round"],
-            "direction": session["direction"],
-            "just_reversed": session.get("just_reversed", False),
-            "assigned_indices": [int(i) for i in selected] if selected else []
-        }
-
-        # Apply assignment and assignment order
-        for s in selected:
-            try:
-                idx = int(s)
-            except Exception:
-                continue
-            if 0 <= idx < len(session["items"]):
-                session["items"][idx]["assigned_to"] = picker.id
-                session["items"][idx]["assigned_order"] = session["assignment_counter"]
-                session["assignment_counter"] += 1
-
-        session["selected_items"] = None
-        _advance_turn_snake(session)
-        await _reset_session_timeout(self.session_id)
+        async with session.lock:
+            stale = self._is_stale(session)
+            if not stale:
+                prev_turn = session.current_turn
+                items = session.items
+                # First come, first served: an item that is already assigned is never moved
+                # to this picker (that would also make Undo drop the earlier owner's claim).
+                # Sorted once here so items are assigned (and logged) in list order.
+                count = len(items)
+                taken = [idx for idx in sorted(session.selected_items or ()) if 0 <= idx < count and items[idx].assigned_to is None]
+                session.last_action = {
+                    "turn": session.current_turn,
+                    "round": session.round,
+                    "direction": session.direction,
+                    "just_reversed": session.just_reversed,
+                    "assigned_indices": taken
+                }
+
+                # Apply assignment and assignment order. unassigned_indices is sorted,
+                # so each taken index is located by bisection instead of a linear remove().
+                # The log and the counter are updated once for the whole batch.
+                unassigned = session.unassigned_indices
+                for order, idx in enumerate(taken, session.assignment_counter):
+                    del unassigned[bisect_left(unassigned, idx)]
+                    item = items[idx]
+                    item.assigned_to = picker_id
+                    item.assigned_order = order
+                if taken:
+                    session.assigned_by_owner.setdefault(picker_id, []).extend(taken)
+                    session.assignment_counter += len(taken)
+                    _mark_items_changed(session)
+
+                session.selected_items = None
+                _advance_turn_snake(session)
+        if stale:
+            await self._reject_stale(interaction)
+            return
 
+        # The edit is the interaction's acknowledgement: send it before any bookkeeping.
         new_text, active = _item_message_text_and_active(session)
-        new_view = ItemDropdownView(self.session_id) if active else None
-
-        edited = await self._fast_edit(interaction, new_text, new_view)
-        # after assignment, force delete+recreate of the item message to ensure a fresh state
-        _schedule_refresh(self.session_id, delete_item=True)
+        await self._fast_edit(interaction, new_text, active)
+        _reset_session_timeout(self.session_id)
+        # A new picker gets a freshly sent item message (edits don't ping the mention).
+        # If the same picker goes again (snake edge), the in-place edit above is enough.
+        _schedule_refresh(self.session_id, delete_item=session.current_turn != prev_turn)
 
     async def on_skip(self, interaction: nextcord.Interaction):
         """
         Skip the current pick. Only the picker or invoker can skip.
         Records undo state if appropriate.
         """
-        session = loot_sessions.get(self.session_id)
+        session = self.session
         if not session:
-            try:
-                await interaction.response.send_message("Session expired.", ephemeral=True)
-            except Exception:
-                pass
+            await _ignore(interaction.response.send_message(MSG_SESSION_EXPIRED, ephemeral=True))
             return
 
-        if 0 <= session["current_turn"] < len(session["rolls"]):
-            picker = session["rolls"][session["current_turn"]]["member"]
-            if interaction.user.id not in (picker.id, session["invoker_id"]):
-                try:
-                    await interaction.response.send_message("🛡️ Only the current picker or the Loot Manager can skip the turn.", ephemeral=True)
-                except Exception:
-                    pass
+        if 0 <= session.current_turn < len(session.rolls):
+            picker_id = session.rolls[session.current_turn].member_id
+            if interaction.user.id not in (picker_id, session.invoker_id):
+                await _ignore(interaction.response.send_message("🛡️ Only the current picker or the Loot Manager can skip the turn.", ephemeral=True))
                 return
 
-        if session["current_turn"] != TURN_NOT_STARTED:
-            session["last_action"] = {
-                "turn": session["current_turn"],
-                "round": session["round"],
-                "direction": session["direction"],
-                "just_reversed": session.get("just_reversed", False),
-                "assigned_indices": []
-            }
-
-        session["selected_items"] = None
-        if session["current_turn"] == TURN_NOT_STARTED:
-            session["members_to_remove"] = None
-            session["last_action"] = None
-
-        _advance_turn_snake(session)
-        await _reset_session_timeout(self.session_id)
+        async with session.lock:
+            stale = self._is_stale(session)
+            if not stale:
+                if session.current_turn != TURN_NOT_STARTED:
+                    session.last_action = {
+                        "turn": session.current_turn,
+                        "round": session.round,
+                        "direction": session.direction,
+                        "just_reversed": session.just_reversed,
+                        "assigned_indices": []
+                    }
+
+                session.selected_items = None
+                if session.current_turn == TURN_NOT_STARTED:
+                    session.members_to_remove = None
+                    session.last_action = None
+
+                _advance_turn_snake(session)
+        if stale:
+            await self._reject_stale(interaction)
+            return
 
         new_text, active = _item_message_text_and_active(session)
-        new_view = ItemDropdownView(self.session_id) if active else None
-
-        await self._fast_edit(interaction, new_text, new_view)
+        await self._fast_edit(interaction, new_text, active)
+        _reset_session_timeout(self.session_id)
         _schedule_refresh(self.session_id, delete_item=True)
 
     async def on_skip_remaining(self, interaction: nextcord.Interaction):
@@ -761,51 +1101,51 @@ class ItemDropdownView(nextcord.ui.View):
         They remain in the lists but are skipped in turn order.
         Allowed for: Current picker or Loot Master.
         """
-        session = loot_sessions.get(self.session_id)
+        session = self.session
         if not session:
-            try:
-                await interaction.response.send_message("Session expired.", ephemeral=True)
-            except: pass
+            await _ignore(interaction.response.send_message(MSG_SESSION_EXPIRED, ephemeral=True))
             return
 
-        if not (0 <= session["current_turn"] < len(session["rolls"])):
-            try:
-                await interaction.response.send_message("No active turn.", ephemeral=True)
-            except: pass
+        if not (0 <= session.current_turn < len(session.rolls)):
+            await _ignore(interaction.response.send_message("No active turn.", ephemeral=True))
             return
 
-        current_roller = session["rolls"][session["current_turn"]]
-        picker_member = current_roller["member"]
+        picker_id = session.rolls[session.current_turn].member_id
         
         # Permission check
-        if interaction.user.id not in (picker_member.id, session["invoker_id"]):
-             try:
-                await interaction.response.send_message("🛡️ Only the current picker or the Loot Manager can use this.", ephemeral=True)
-             except: pass
+        if interaction.user.id not in (picker_id, session.invoker_id):
+             await _ignore(interaction.response.send_message("🛡️ Only the current picker or the Loot Manager can use this.", ephemeral=True))
              return
 
-        # Snapshot for undo
-        session["last_action"] = {
-            "turn": session["current_turn"],
-            "round": session["round"],
-            "direction": session["direction"],
-            "just_reversed": session.get("just_reversed", False),
-            "assigned_indices": [],
-            "skipped_turn_action": True # Marker to identify this specific type of skip action for undo
-        }
-
-        # Mark the user as skipped in the rolls list
-        session["rolls"][session["current_turn"]]["skipped"] = True
-
-        session["selected_items"] = None
+        async with session.lock:
+            stale = self._is_stale(session)
+            if not stale:
+                # Snapshot for undo
+                session.last_action = {
+                    "turn": session.current_turn,
+                    "round": session.round,
+                    "direction": session.direction,
+                    "just_reversed": session.just_reversed,
+                    "assigned_indices": [],
+                    "skipped_turn_action": True # Marker to identify this specific type of skip action for undo
+                }
+
+                # Mark the user as skipped in the rolls list
+                roller = session.rolls[session.current_turn]
+                if not roller.skipped:
+                    roller.skipped = True
+                    session.skipped_count += 1
+
+                session.selected_items = None
         
-        _advance_turn_snake(session)
-        await _reset_session_timeout(self.session_id)
+                _advance_turn_snake(session)
+        if stale:
+            await self._reject_stale(interaction)
+            return
+        _reset_session_timeout(self.session_id)
         
         # Force refresh
-        try:
-            await interaction.response.defer()
-        except: pass
+        await _ignore(interaction.response.defer())
         _schedule_refresh(self.session_id, delete_item=True)
 
     async def on_undo(self, interaction: nextcord.Interaction):
@@ -813,75 +1153,68 @@ class ItemDropdownView(nextcord.ui.View):
         Undo the last assign/skip action. Only the Loot Manager (invoker) can undo.
         Restores assigned items referenced in last_action.
         """
-        session = loot_sessions.get(self.session_id)
+        session = self.session
         if not session:
-            try:
-                await interaction.response.send_message("Session expired.", ephemeral=True)
-            except Exception:
-                pass
+            await _ignore(interaction.response.send_message(MSG_SESSION_EXPIRED, ephemeral=True))
             return
 
-        if interaction.user.id != session["invoker_id"]:
-            try:
-                await interaction.response.send_message("🛡️ Only the Loot Manager can use Undo.", ephemeral=True)
-            except Exception:
-                pass
+        if interaction.user.id != session.invoker_id:
+            await _ignore(interaction.response.send_message(MSG_ONLY_MANAGER_UNDO, ephemeral=True))
             return
 
-        last = session.get("last_action")
+        async with session.lock:
+            last = session.last_action
+            if last:
+                for idx in last.get("assigned_indices", []):
+                    if 0 <= idx < len(session.items):
+                        owner = session.items[idx].assigned_to
+                        if owner is not None:
+                            insort(session.unassigned_indices, idx)
+                            session.assigned_by_owner[owner].remove(idx)
+                        session.items[idx].assigned_to = None
+                        # Clear order to keep data clean, though re-assigning will overwrite it
+                        session.items[idx].assigned_order = -1
+
+                # Restore turn state
+                session.current_turn = last["turn"]
+                session.round = last["round"]
+                session.direction = last["direction"]
+                session.just_reversed = last.get("just_reversed", False)
+                _mark_items_changed(session)
+        
+                # If the last action was "Skip Remaining", unmark the skipped status
+                if last.get("skipped_turn_action"):
+                     if 0 <= last["turn"] < len(session.rolls) and session.rolls[last["turn"]].skipped:
+                         session.rolls[last["turn"]].skipped = False
+                         session.skipped_count -= 1
+
+                session.last_action = None
+                session.selected_items = None
         if not last:
-            try:
-                await interaction.response.send_message("❌ There is nothing to undo.", ephemeral=True)
-            except Exception:
-                pass
+            await _ignore(interaction.response.send_message(MSG_NOTHING_TO_UNDO, ephemeral=True))
             return
 
-        for idx in last.get("assigned_indices", []):
-            if 0 <= idx < len(session["items"]):
-                session["items"][idx]["assigned_to"] = None
-                # Clear order to keep data clean, though re-assigning will overwrite it
-                session["items"][idx]["assigned_order"] = -1
-
-        # Restore turn state
-        session["current_turn"] = last["turn"]
-        session["round"] = last["round"]
-        session["direction"] = last["direction"]
-        session["just_reversed"] = last.get("just_reversed", False)
-        
-        # If the last action was "Skip Remaining", unmark the skipped status
-        if last.get("skipped_turn_action"):
-             if 0 <= last["turn"] < len(session["rolls"]):
-                 session["rolls"][last["turn"]]["skipped"] = False
-
-        session["last_action"] = None
-        session["selected_items"] = None
-
-        await _reset_session_timeout(self.session_id)
+        _reset_session_timeout(self.session_id)
         new_text, active = _item_message_text_and_active(session)
-        new_view = ItemDropdownView(self.session_id) if active else None
-        await self._fast_edit(interaction, new_text, new_view)
+        await self._fast_edit(interaction, new_text, active)
         _schedule_refresh(self.session_id, delete_item=True)
 
     async def on_add_item(self, interaction: nextcord.Interaction):
         """
         Open the modal to add an item. Only for Loot Master.
         """
-        session = loot_sessions.get(self.session_id)
+        session = self.session
         if not session:
-            try:
-                 await interaction.response.send_message("Session expired.", ephemeral=True)
-            except: pass
+            await _ignore(interaction.response.send_message(MSG_SESSION_EXPIRED, ephemeral=True))
             return
 
-        if interaction.user.id != session["invoker_id"]:
-            try:
-                await interaction.response.send_message("🛡️ Only the Loot Manager can add items.", ephemeral=True)
-            except: pass
+        if interaction.user.id != session.invoker_id:
+            await _ignore(interaction.response.send_message("🛡️ Only the Loot Manager can add items.", ephemeral=True))
             return
             
         await interaction.response.send_modal(AddItemModal(self.session_id))
 
-class ControlPanelView(nextcord.ui.View):
+class ControlPanelView(_SessionBound, nextcord.ui.View):
     """
     Control panel used by the Loot Manager to remove participants or start assignment.
     Only the invoker can interact with these controls (enforced by interaction_check).
@@ -894,164 +1227,132 @@ class ControlPanelView(nextcord.ui.View):
     def _populate(self):
         """
         Populate remove-select and start button when the session hasn't started.
-        Uses session['members_to_remove'] (list[str]) to keep defaults for the select.
+        Uses session.members_to_remove (frozenset[int]) to keep defaults for the select.
         """
         self.clear_items()
-        session = loot_sessions.get(self.session_id)
+        session = self.session
         if not session:
             return
 
-        if session["current_turn"] == TURN_NOT_STARTED:
+        if session.current_turn == TURN_NOT_STARTED:
             options = []
-            inv = session["invoker_id"]
-            members_to_remove = set(session.get("members_to_remove") or [])
-            for r in session["rolls"]:
-                if r["member"].id != inv:
-                    val = str(r["member"].id)
-                    default_selected = val in members_to_remove
-                    options.append(nextcord.SelectOption(label=r["member"].display_name, value=val, default=default_selected))
+            inv = session.invoker_id
+            members_to_remove = session.members_to_remove or frozenset()
+            for r in session.rolls:
+                if r.member_id != inv:
+                    val = str(r.member_id)
+                    default_selected = r.member_id in members_to_remove
+                    options.append(nextcord.SelectOption(label=r.name, value=val, default=default_selected))
             if options:
-                self.add_item(nextcord.ui.Select(placeholder="Select participants to remove...", options=options, custom_id="remove_select", min_values=0, max_values=len(options)))
-            self.add_item(nextcord.ui.Button(label="Remove Selected", style=nextcord.ButtonStyle.danger, emoji="✖️", custom_id="remove_confirm_button"))
-            self.add_item(nextcord.ui.Button(label="📜 Start Loot Assignment!", style=nextcord.ButtonStyle.success, custom_id="start_button"))
-        for child in self.children:
-            if getattr(child, "custom_id", "") == "remove_select":
-                child.callback = self.on_remove_select
-            if getattr(child, "custom_id", "") == "remove_confirm_button":
-                child.callback = self.on_remove_confirm
-            if getattr(child, "custom_id", "") == "start_button":
-                child.callback = self.on_start
+                select = nextcord.ui.Select(placeholder="Select participants to remove...", options=options, custom_id="remove_select", min_values=0, max_values=len(options))
+                select.callback = self.on_remove_select
+                self.add_item(select)
+            self.add_item(_button(self.on_remove_confirm, label="Remove Selected", style=nextcord.ButtonStyle.danger, emoji="✖️", custom_id="remove_confirm_button"))
+            self.add_item(_button(self.on_start, label="📜 Start Loot Assignment!", style=nextcord.ButtonStyle.success, custom_id="start_button"))
 
     async def interaction_check(self, interaction: nextcord.Interaction) -> bool:
         """
         Only the session invoker can interact with the control panel; others receive an ephemeral notice.
         """
-        session = loot_sessions.get(self.session_id)
+        session = self.session
         if not session:
-            try:
-                await interaction.response.send_message("❌ Session expired or not found.", ephemeral=True)
-            except Exception:
-                pass
+            await _ignore(interaction.response.send_message("❌ Session expired or not found.", ephemeral=True))
             return False
-        if interaction.user.id == session["invoker_id"]:
+        if interaction.user.id == session.invoker_id:
             return True
-        try:
-            await interaction.response.send_message(f"🛡️ Only {session['invoker'].mention} can use control-panel buttons.", ephemeral=True)
-        except Exception:
-            pass
+        await _ignore(interaction.response.send_message(f"🛡️ Only {session.invoker_mention} can use control-panel buttons.", ephemeral=True))
         return False
 
     async def on_remove_select(self, interaction: nextcord.Interaction):
         """
-        Persist removal selections into session['members_to_remove'] (list[str]) and re-render view.
+        Persist removal selections into session.members_to_remove (frozenset[int]) and re-render view.
+        A selection equal to the current one only acknowledges the interaction.
         """
-        session = loot_sessions.get(self.session_id)
+        session = self.session
         if not session:
-            try:
-                await interaction.response.send_message("Session expired.", ephemeral=True)
-            except Exception:
-                pass
+            await _ignore(interaction.response.send_message(MSG_SESSION_EXPIRED, ephemeral=True))
             return
         vals = interaction.data.get("values") or []
-        session["members_to_remove"] = list(vals)
-        self._populate()
+        selection = frozenset(int(v) for v in vals if v.isdigit())
+        async with session.lock:
+            changed = selection != session.members_to_remove
+            if changed:
+                session.members_to_remove = selection
+                self._populate()
+        if not changed:
+            await _ignore(interaction.response.defer())
+            return
         try:
             await interaction.response.edit_message(view=self)
+            session.last_control_view = _control_view_signature(session)
         except Exception:
-            try:
-                await interaction.response.defer(ephemeral=True)
-            except Exception:
-                pass
+            await _ignore(interaction.response.defer(ephemeral=True))
 
     async def on_remove_confirm(self, interaction: nextcord.Interaction):
         """
-        Remove chosen participants from session['rolls']. If no participants remain,
+        Remove chosen participants from session.rolls. If no participants remain,
         cancel the session and clean up messages and tasks.
         """
-        session = loot_sessions.get(self.session_id)
+        session = self.session
         if not session:
-            try:
-                await interaction.response.send_message("Session expired.", ephemeral=True)
-            except Exception:
-                pass
+            await _ignore(interaction.response.send_message(MSG_SESSION_EXPIRED, ephemeral=True))
             return
-        vals = session.get("members_to_remove") or []
-        to_remove = set()
-        for v in vals:
-            try:
-                to_remove.add(int(v))
-            except Exception:
-                continue
+        async with session.lock:
+            to_remove = session.members_to_remove or frozenset()
+            if to_remove:
+                session.rolls = [r for r in session.rolls if r.member_id not in to_remove]
+                session.skipped_count = sum(1 for r in session.rolls if r.skipped)
+                session.item_text_cache.clear()
+                session.roll_rows = None
+                session.owner_rows = None
+                _mark_changed(session)
+                session.members_to_remove = None
+                if session.rolls and session.current_turn != TURN_NOT_STARTED and session.current_turn >= len(session.rolls):
+                    session.current_turn = max(0, len(session.rolls) - 1)
         if to_remove:
-            session["rolls"] = [r for r in session["rolls"] if r["member"].id not in to_remove]
-            session["members_to_remove"] = None
-            if not session["rolls"]:
-                ch = bot.get_channel(session["channel_id"])
-                try:
-                    lm = await _get_msg(ch, session.get("loot_list_message_id"))
-                    if lm:
-                        await lm.delete()
-                except Exception:
-                    pass
-                try:
-                    it = await _get_msg(ch, session.get("item_dropdown_message_id"))
-                    if it:
-                        await it.delete()
-                except Exception:
-                    pass
-                try:
-                    ctrl = await _get_msg(ch, self.session_id)
-                    if ctrl:
-                        await ctrl.edit(content="⚠️ The loot session was cancelled — no participants remain.", view=None)
-                except Exception:
-                    pass
-                t = session.get("timeout_task")
-                if t:
-                    try:
-                        t.cancel()
-                    except Exception:
-                        pass
-                loot_sessions.pop(self.session_id, None)
-                session_locks.pop(self.session_id, None)
-                try:
-                    await interaction.response.send_message("Session cancelled — no participants remain.", ephemeral=True)
-                except Exception:
-                    pass
+            if not session.rolls:
+                ch = bot.get_channel(session.channel_id)
+                async with asyncio.TaskGroup() as tg:
+                    tg.create_task(_ignore(_delete_msg(ch, session.loot_list_message_id)))
+                    tg.create_task(_ignore(_delete_msg(ch, session.item_dropdown_message_id)))
+                    tg.create_task(_ignore(_edit_msg(ch, self.session_id, content="⚠️ The loot session was cancelled — no participants remain.", view=None)))
+                _end_session(self.session_id)
+                await _ignore(interaction.response.send_message("Session cancelled — no participants remain.", ephemeral=True))
                 return
-            if session["current_turn"] != TURN_NOT_STARTED and session["current_turn"] >= len(session["rolls"]):
-                session["current_turn"] = max(0, len(session["rolls"]) - 1)
+        else:
+            # Nothing selected: nothing visible changes, so don't re-render or re-edit anything.
+            await _ignore(interaction.response.defer(ephemeral=True))
+            return
 
-        await _reset_session_timeout(self.session_id)
-        try:
-            await interaction.response.defer(ephemeral=True)
-        except Exception:
-            pass
+        _reset_session_timeout(self.session_id)
+        await _ignore(interaction.response.defer(ephemeral=True))
         _schedule_refresh(self.session_id, delete_item=True)
 
     async def on_start(self, interaction: nextcord.Interaction):
         """
         Start the assignment process by advancing to the first turn.
         """
-        session = loot_sessions.get(self.session_id)
+        session = self.session
         if not session:
-            try:
-                await interaction.response.send_message("Session expired.", ephemeral=True)
-            except Exception:
-                pass
+            await _ignore(interaction.response.send_message(MSG_SESSION_EXPIRED, ephemeral=True))
             return
-        session["members_to_remove"] = None
-        session["selected_items"] = None
-        session["last_action"] = None
-        _advance_turn_snake(session)
-        await _reset_session_timeout(self.session_id)
-        try:
-            await interaction.response.defer(ephemeral=True)
-        except Exception:
-            pass
+        async with session.lock:
+            # A double-clicked Start must not advance the turn twice
+            started = session.current_turn == TURN_NOT_STARTED
+            if started:
+                session.members_to_remove = None
+                session.selected_items = None
+                session.last_action = None
+                _advance_turn_snake(session)
+        if not started:
+            await _ignore(interaction.response.defer(ephemeral=True))
+            return
+        _reset_session_timeout(self.session_id)
+        await _ignore(interaction.response.defer(ephemeral=True))
         _schedule_refresh(self.session_id, delete_item=True)
 
 
-class FinalizeView(nextcord.ui.View):
+class FinalizeView(_SessionBound, nextcord.ui.View):
     """
     View shown when all items have been assigned. Only the invoker can interact.
     Provides two buttons:
@@ -1062,182 +1363,176 @@ class FinalizeView(nextcord.ui.View):
         super().__init__(timeout=None)
         self.session_id = session_id
         # Buttons
-        self.add_item(nextcord.ui.Button(label="📝 Finish Loot Distribution", style=nextcord.ButtonStyle.success, custom_id="finalize_finish"))
-        self.add_item(nextcord.ui.Button(label="↩️ Undo", style=nextcord.ButtonStyle.secondary, custom_id="finalize_undo"))
-        for child in self.children:
-            if getattr(child, "custom_id", "") == "finalize_finish":
-                child.callback = self.on_finish
-            if getattr(child, "custom_id", "") == "finalize_undo":
-                child.callback = self.on_undo
+        self.add_item(_button(self.on_finish, label="📝 Finish Loot Distribution", style=nextcord.ButtonStyle.success, custom_id="finalize_finish"))
+        self.add_item(_button(self.on_undo, label="↩️ Undo", style=nextcord.ButtonStyle.secondary, custom_id="finalize_undo"))
 
     async def interaction_check(self, interaction: nextcord.Interaction) -> bool:
-        session = loot_sessions.get(self.session_id)
+        session = self.session
         if not session:
-            try:
-                await interaction.response.send_message("Session expired.", ephemeral=True)
-            except Exception:
-                pass
+            await _ignore(interaction.response.send_message(MSG_SESSION_EXPIRED, ephemeral=True))
             return False
-        if interaction.user.id == session["invoker_id"]:
+        if interaction.user.id == session.invoker_id:
             return True
-        try:
-            await interaction.response.send_message(f"🛡️ Only {session['invoker'].mention} can use these controls.", ephemeral=True)
-        except Exception:
-            pass
+        await _ignore(interaction.response.send_message(f"🛡️ Only {session.invoker_mention} can use these controls.", ephemeral=True))
         return False
 
     async def on_finish(self, interaction: nextcord.Interaction):
         """Merge messages and finish the loot distribution (same as prior finalization)."""
-        session = loot_sessions.get(self.session_id)
+        session = self.session
         if not session:
-            try:
-                await interaction.response.send_message("Session expired.", ephemeral=True)
-            except Exception:
-                pass
+            await _ignore(interaction.response.send_message(MSG_SESSION_EXPIRED, ephemeral=True))
             return
 
         # Acknowledge quickly
         try:
             await interaction.response.defer()
         except Exception:
-            try:
-                await interaction.response.send_message("Finishing...", ephemeral=True)
-            except Exception:
-                pass
+            await _ignore(interaction.response.send_message("Finishing...", ephemeral=True))
 
-        ch = bot.get_channel(session["channel_id"])
+        ch = bot.get_channel(session.channel_id)
         final = build_final_summary_message(session, timed_out=False)
-        try:
-            ctrl = await _get_msg(ch, self.session_id)
-            if ctrl:
-                await ctrl.edit(content=final, view=None)
-            else:
-                fallback = await _get_msg(ch, self.session_id)
-                if fallback:
-                    await fallback.edit(content=final, view=None)
-        except Exception:
-            pass
+        # Merge the summary into the control panel and delete the loot list and
+        # item message (this finalize message included) concurrently.
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(_ignore(_edit_msg(ch, self.session_id, content=final, view=None)))
+            tg.create_task(_ignore(_delete_msg(ch, session.loot_list_message_id)))
+            tg.create_task(_ignore(_delete_msg(ch, session.item_dropdown_message_id)))
 
-        # delete loot list message
-        try:
-            lm = await _get_msg(ch, session.get("loot_list_message_id"))
-            if lm:
-                await lm.delete()
-        except Exception:
-            pass
-
-        # delete any item message (this finalize message included)
-        try:
-            existing = session.get("item_dropdown_message_id")
-            if existing:
-                maybe = await _get_msg(ch, existing)
-                if maybe:
-                    try:
-                        await maybe.delete()
-                    except Exception:
-                        pass
-        except Exception:
-            pass
-
-        # cancel timeout and remove session
-        t = session.get("timeout_task")
-        if t:
-            try:
-                t.cancel()
-            except Exception:
-                pass
         # clear finalize marker and remove session
-        session.pop("finalize_shown", None)
-        loot_sessions.pop(self.session_id, None)
-        session_locks.pop(self.session_id, None)
+        session.finalize_shown = False
+        _end_session(self.session_id)
 
     async def on_undo(self, interaction: nextcord.Interaction):
-        """Undo the last assign/skip action (invoker only) and resume the rounds."""
-        session = loot_sessions.get(self.session_id)
+        """
+        Undo the last assign/skip action and resume the rounds. interaction_check has
+        already limited this to the invoker and resolved the (cached) session.
+        """
+        session = self.session
         if not session:
-            try:
-                await interaction.response.send_message("Session expired.", ephemeral=True)
-            except Exception:
-                pass
-            return
-
-        # only invoker allowed (double-check)
-        if interaction.user.id != session["invoker_id"]:
-            try:
-                await interaction.response.send_message("🛡️ Only the Loot Manager can use Undo.", ephemeral=True)
-            except Exception:
-                pass
+            await _ignore(interaction.response.send_message(MSG_SESSION_EXPIRED, ephemeral=True))
             return
 
-        last = session.get("last_action")
+        async with session.lock:
+            last = session.last_action
+            if last:
+                # Undo assigned indices
+                for idx in last.get("assigned_indices", []):
+                    if 0 <= idx < len(session.items):
+                        owner = session.items[idx].assigned_to
+                        if owner is not None:
+                            insort(session.unassigned_indices, idx)
+                            session.assigned_by_owner[owner].remove(idx)
+                        session.items[idx].assigned_to = None
+                        session.items[idx].assigned_order = -1
+
+                session.current_turn = last["turn"]
+                session.round = last["round"]
+                session.direction = last["direction"]
+                session.just_reversed = last.get("just_reversed", False)
+                _mark_items_changed(session)
+        
+                # Undo skipped status if applicable
+                if last.get("skipped_turn_action"):
+                     if 0 <= last["turn"] < len(session.rolls) and session.rolls[last["turn"]].skipped:
+                         session.rolls[last["turn"]].skipped = False
+                         session.skipped_count -= 1
+
+                session.last_action = None
+                session.selected_items = None
         if not last:
-            try:
-                await interaction.response.send_message("❌ There is nothing to undo.", ephemeral=True)
-            except Exception:
-                pass
+            await _ignore(interaction.response.send_message(MSG_NOTHING_TO_UNDO, ephemeral=True))
             return
 
-        # Undo assigned indices
-        for idx in last.get("assigned_indices", []):
-            if 0 <= idx < len(session["items"]):
-                session["items"][idx]["assigned_to"] = None
-                session["items"][idx]["assigned_order"] = -1
-
-        session["current_turn"] = last["turn"]
-        session["round"] = last["round"]
-        session["direction"] = last["direction"]
-        session["just_reversed"] = last.get("just_reversed", False)
-        
-        # Undo skipped status if applicable
-        if last.get("skipped_turn_action"):
-             if 0 <= last["turn"] < len(session["rolls"]):
-                 session["rolls"][last["turn"]]["skipped"] = False
-
-        session["last_action"] = None
-        session["selected_items"] = None
-
         # reset timeout
-        await _reset_session_timeout(self.session_id)
+        _reset_session_timeout(self.session_id)
 
         # delete the finalize message and recreate the normal item dropdown flow
-        ch = bot.get_channel(session["channel_id"])
-        try:
-            existing = session.get("item_dropdown_message_id")
-            if existing:
-                maybe = await _get_msg(ch, existing)
-                if maybe:
-                    try:
-                        await maybe.delete()
-                    except Exception:
-                        pass
-        except Exception:
-            pass
-        session["item_dropdown_message_id"] = None
+        ch = bot.get_channel(session.channel_id)
+        await _ignore(_delete_msg(ch, session.item_dropdown_message_id))
+        session.item_dropdown_message_id = None
+        _swap_view(session, "finalize_view", None)
         # clear finalize marker since we returned to active flow
-        session.pop("finalize_shown", None)
+        session.finalize_shown = False
 
         # refresh all messages, force creation of item dropdown
         _schedule_refresh(self.session_id, delete_item=True)
 
 # ---------- Message lifecycle, refresh, and timeout ----------
-async def _reset_session_timeout(session_id: int):
+def _compact_timeout_heap() -> None:
+    """
+    Drop stale heap entries (superseded by a later reset, cancelled, or for sessions
+    already gone) so the heap stays proportional to the live sessions instead of to
+    the number of interactions in the last SESSION_TIMEOUT_SECONDS.
     """
-    Cancel any existing timeout task and schedule a fresh timeout for the session.
+    live = [e for e in _timeout_heap if (s := loot_sessions.get(e[1])) is not None and s.timeout_gen == e[2]]
+    _timeout_heap[:] = live
+    heapify(_timeout_heap)
+
+def _reset_session_timeout(session_id: int):
+    """
+    Push the session's deadline SESSION_TIMEOUT_SECONDS into the future.
+    Older heap entries for the session become stale via timeout_gen; the
+    timeout loop is only woken if this deadline is earlier than its current one.
     """
+    global _timeout_task
     session = loot_sessions.get(session_id)
     if not session:
         return
-    task = session.get("timeout_task")
-    if task:
-        try:
-            task.cancel()
-        except Exception:
-            pass
-    session["timeout_task"] = asyncio.create_task(_schedule_session_timeout(session_id))
+    session.timeout_gen += 1
+    if len(_timeout_heap) > 2 * len(loot_sessions) + 32:
+        _compact_timeout_heap()
+    deadline = time.monotonic() + SESSION_TIMEOUT_SECONDS
+    if not _timeout_heap or deadline < _timeout_heap[0][0]:
+        _timeout_wakeup.set()
+    heappush(_timeout_heap, (deadline, session_id, session.timeout_gen))
     try:
-        session["expires_at"] = int(time.time() + SESSION_TIMEOUT_SECONDS)
+        session.expires_at = int(time.time() + SESSION_TIMEOUT_SECONDS)
     except Exception:
-        session["expires_at"] = None
+        session.expires_at = None
+    if _timeout_task is None or _timeout_task.done():
+        _timeout_task = asyncio.create_task(_timeout_loop())
+
+def _cancel_session_timeout(session: LootSession) -> None:
+    """Invalidate the session's pending deadline (its heap entry is dropped when it comes up)."""
+    session.timeout_gen += 1
+
+def _end_session(session_id: int) -> LootSession | None:
+    """
+    Remove the session from the store, cancel its timeout and mark it ended so
+    views still holding a reference treat it as expired. Returns the removed session.
+    """
+    session = loot_sessions.pop(session_id, None)
+    if session:
+        _cancel_session_timeout(session)
+        session.ended = True
+        # The session's messages are deleted or stripped of components as it ends; stop
+        # their views so nextcord's view store doesn't keep them (and this session) in memory.
+        for attr in ("item_view", "control_view", "finalize_view"):
+            _swap_view(session, attr, None)
+    return session
+
+async def _timeout_loop():
+    """
+    Sleep until the earliest deadline in _timeout_heap, expire every session whose
+    current entry is due, and repeat. Stale entries (reset or cancelled since they
+    were pushed, or for sessions already gone) are discarded as they surface.
+    """
+    while True:
+        now = time.monotonic()
+        while _timeout_heap and _timeout_heap[0][0] <= now:
+            _, session_id, gen = heappop(_timeout_heap)
+            session = loot_sessions.get(session_id)
+            if session and session.timeout_gen == gen:
+                # A separate task, so cancelling this loop never interrupts a cleanup in progress.
+                t = asyncio.create_task(_expire_session(session_id))
+                _expiry_tasks.add(t)
+                t.add_done_callback(_expiry_tasks.discard)
+        _timeout_wakeup.clear()
+        delay = _timeout_heap[0][0] - now if _timeout_heap else None
+        try:
+            await asyncio.wait_for(_timeout_wakeup.wait(), timeout=delay)
+        except TimeoutError:
+            pass
 
 async def _refresh_all_messages(session_id: int, delete_item: bool = True):
     """
@@ -1247,216 +1542,244 @@ async def _refresh_all_messages(session_id: int, delete_item: bool = True):
       - item dropdown (third, recreated as requested)
     The delete_item flag controls whether the third message is forcibly deleted
     and recreated (used to force a fresh view).
+    Only ever runs from _drain_refreshes, so at most one render per session is in flight.
     """
     session = loot_sessions.get(session_id)
     if not session:
         return
-    lock = session_locks.setdefault(session_id, asyncio.Lock())
-    async with lock:
-        ch = bot.get_channel(session["channel_id"])
-        if not ch:
-            t = session.get("timeout_task")
-            if t:
-                try:
-                    t.cancel()
-                except Exception:
-                    pass
-            loot_sessions.pop(session_id, None)
-            session_locks.pop(session_id, None)
-            return
-
-        control_msg = await _get_msg(ch, session_id)
-        loot_msg = await _get_msg(ch, session.get("loot_list_message_id"))
-        existing_item_msg = None
-        existing_item_id = session.get("item_dropdown_message_id")
-        if existing_item_id:
-            existing_item_msg = await _get_msg(ch, existing_item_id)
-
-        # Optionally delete the item message to force a clean recreate.
-        if delete_item and existing_item_msg:
-            try:
-                await existing_item_msg.delete()
-            except Exception:
-                pass
-            session["item_dropdown_message_id"] = None
-            existing_item_msg = None
-            existing_item_id = None
+    ch = bot.get_channel(session.channel_id)
+    if not ch:
+        _end_session(session_id)
+        return
 
-        # If distribution complete, show final summary and present a finalize view
-        # to the invoker instead of immediately tearing down. The finalize view
-        # allows the invoker to Finish (merge messages) or Undo the last action.
-        if not _are_items_left(session) and session["current_turn"] != TURN_NOT_STARTED:
-            # Ensure we renew the session timeout when presenting the finalize view
-            # so the control panel shows the 10-minute expiry timer for the invoker.
-            await _reset_session_timeout(session_id)
+    # The three lookups are independent; resolve them concurrently.
+    existing_item_id = session.item_dropdown_message_id
+    control_msg, loot_msg, existing_item_msg = await asyncio.gather(
+        _session_msg(session, ch, "control_msg", session_id),
+        _session_msg(session, ch, "loot_msg", session.loot_list_message_id),
+        _current_item_msg(session, ch, existing_item_id)
+    )
 
+    # A recreate exists to ping a new picker. If the existing item message was sent
+    # for this same turn (e.g. only just_reversed or the item list changed), editing it is enough.
+    if delete_item and existing_item_msg and session.item_msg_turn == (existing_item_id, session.current_turn):
+        delete_item = False
 
-            # build final control content and edit control message (only if changed)
-            final_ctrl = build_control_panel_message(session)
+    # Optionally delete the item message to force a clean recreate.
+    if delete_item and existing_item_msg:
+        await _ignore(existing_item_msg.delete())
+        session.item_dropdown_message_id = None
+        existing_item_msg = None
+        existing_item_id = None
+
+    # If distribution complete, show final summary and present a finalize view
+    # to the invoker instead of immediately tearing down. The finalize view
+    # allows the invoker to Finish (merge messages) or Undo the last action.
+    if not _are_items_left(session) and session.current_turn != TURN_NOT_STARTED:
+        # Ensure we renew the session timeout when presenting the finalize view
+        # so the control panel shows the 10-minute expiry timer for the invoker.
+        _reset_session_timeout(session_id)
+
+
+        # Edit the control message (only if changed) and delete any existing item
+        # message (it is replaced by the finalize message) concurrently.
+        final_ctrl = _cached_control_panel(session)
+        control_changed = bool(control_msg) and final_ctrl != session.last_control_content
+        control_res, _ = await asyncio.gather(
+            control_msg.edit(content=final_ctrl) if control_changed else _noop(),
+            existing_item_msg.delete() if existing_item_msg else _noop(),
+            return_exceptions=True
+        )
+        if control_changed and not isinstance(control_res, BaseException):
+            session.last_control_content = final_ctrl
+        elif isinstance(control_res, nextcord.HTTPException):
+            session.control_msg = None
+
+        # present the finalize message to the invoker (third message) with FinalizeView
+        finalize_text = session.finalize_text
+        finalize_view = FinalizeView(session_id)
+        # The item message is deleted above; its view goes with it.
+        _swap_view(session, "item_view", None)
+        _swap_view(session, "finalize_view", finalize_view)
+
+        if loot_sessions.get(session_id) is not session:
+            return
+        try:
+            sent = await ch.send(finalize_text, view=finalize_view)
+            session.item_dropdown_message_id = sent.id
+            session.item_msg = sent
+        except Exception:
+            # best-effort: attempt to edit an existing placeholder if present
             try:
-                if control_msg and final_ctrl != session.get("last_control_content"):
-                    await control_msg.edit(content=final_ctrl)
-                    session["last_control_content"] = final_ctrl
+                if existing_item_msg:
+                    await existing_item_msg.edit(content=finalize_text, view=finalize_view)
+                    session.item_dropdown_message_id = existing_item_msg.id
             except Exception:
                 pass
 
-            # present the finalize message to the invoker (third message) with FinalizeView
-            finalize_text = f"✍️ {session['invoker'].mention}\n\nClick an action below to finish or undo the last assignment."
-            finalize_view = FinalizeView(session_id)
+        # Don't proceed further in this refresh (finalize view shown)
+        return
 
-            # delete any existing item message (we'll replace it with finalize)
-            if existing_item_msg:
-                try:
-                    await existing_item_msg.delete()
-                except Exception:
-                    pass
+    # Build current contents and only edit messages if changed to reduce API calls.
+    loot_content = _cached_loot_list(session)
+    control_content = _cached_control_panel(session)
 
-            try:
-                sent = await ch.send(finalize_text, view=finalize_view)
-                session["item_dropdown_message_id"] = sent.id
-            except Exception:
-                # best-effort: attempt to edit an existing placeholder if present
-                try:
-                    if existing_item_msg:
-                        await existing_item_msg.edit(content=finalize_text, view=finalize_view)
-                        session["item_dropdown_message_id"] = existing_item_msg.id
-                except Exception:
-                    pass
-
-            # Don't proceed further in this refresh (finalize view shown)
-            return
+    loot_changed = bool(loot_msg) and loot_content != session.last_loot_content
+    control_changed = bool(control_msg) and control_content != session.last_control_content
 
-        # Build current contents and only edit messages if changed to reduce API calls.
-        loot_content = build_loot_list_message(session)
-        control_content = build_control_panel_message(session)
+    # Only build and send a new ControlPanelView when its components would differ.
+    control_fields = {"content": control_content}
+    view_key = _control_view_signature(session)
+    if control_changed and view_key != session.last_control_view:
+        control_fields["view"] = ControlPanelView(session_id)
 
-        if loot_content != session.get("last_loot_content") and loot_msg:
-            try:
-                await loot_msg.edit(content=loot_content)
-                session["last_loot_content"] = loot_content
-            except Exception:
-                pass
-
-        if control_content != session.get("last_control_content") and control_msg:
-            try:
-                await control_msg.edit(content=control_content, view=ControlPanelView(session_id))
-                session["last_control_content"] = control_content
-            except Exception:
-                pass
-
-        await _reset_session_timeout(session_id)
-
-        # Manage item-picking message: create if active, delete/skip if not
-        is_active = (0 <= session["current_turn"] < len(session["rolls"])) and _are_items_left(session)
-        if not is_active:
-            if not delete_item and existing_item_msg:
-                try:
-                    await existing_item_msg.delete()
-                except Exception:
-                    pass
-                session["item_dropdown_message_id"] = None
-            return
-
-        picker = session["rolls"][session["current_turn"]]["member"]
-        emoji = NUMBER_EMOJIS.get(session["current_turn"] + 1, "👉")
-        turn_text = "turn!" if not session.get("just_reversed", False) else "turn (direction reversed)!"
-        item_text = f"**{emoji} {picker.mention}'s {turn_text}**\n\nChoose item(s) below:"
+    # The two edits target different messages, so overlap their round-trips.
+    loot_res, control_res = await asyncio.gather(
+        loot_msg.edit(content=loot_content) if loot_changed else _noop(),
+        control_msg.edit(**control_fields) if control_changed else _noop(),
+        return_exceptions=True
+    )
+    if loot_changed and not isinstance(loot_res, BaseException):
+        session.last_loot_content = loot_content
+    if control_changed and not isinstance(control_res, BaseException):
+        session.last_control_content = control_content
+        if "view" in control_fields:
+            session.last_control_view = view_key
+            _swap_view(session, "control_view", control_fields["view"])
+    # Drop a cached message object whose edit failed so the next refresh looks it up again.
+    if isinstance(loot_res, nextcord.HTTPException):
+        session.loot_msg = None
+    if isinstance(control_res, nextcord.HTTPException):
+        session.control_msg = None
+
+    _reset_session_timeout(session_id)
+
+    # Manage item-picking message: create if active, delete/skip if not
+    is_active = (0 <= session.current_turn < len(session.rolls)) and _are_items_left(session)
+    if not is_active:
+        if not delete_item and existing_item_msg:
+            await _ignore(existing_item_msg.delete())
+            session.item_dropdown_message_id = None
+        return
 
-        view = ItemDropdownView(session_id)
+    item_text = _item_turn_text(session)
 
-        # Either edit the existing item message (if allowed) or send a fresh one.
-        if existing_item_msg and not delete_item:
-            try:
-                await existing_item_msg.edit(content=item_text, view=view)
-                session["item_dropdown_message_id"] = existing_item_id
-                return
-            except Exception:
-                session["item_dropdown_message_id"] = None
-                existing_item_msg = None
+    signature = _item_view_signature(session)
+    if existing_item_msg and not delete_item and session.last_item_render == (existing_item_id, signature):
+        # Nothing the item message shows has changed since it was last rendered;
+        # re-arm the attached view for the current state (see _fast_edit).
+        if session.item_view is not None:
+            session.item_view.built_for = (session.current_turn, session.state_version)
+        return
 
+    # Either edit the existing item message (if allowed) or send a fresh one.
+    if existing_item_msg and not delete_item:
+        view = _attached_item_view(session, existing_item_id, signature)
+        if view is not None:
+            # Only the turn text moved: keep the attached components.
+            edit = existing_item_msg.edit(content=item_text)
+        else:
+            view = ItemDropdownView(session_id)
+            edit = existing_item_msg.edit(content=item_text, view=view)
         try:
-            new_msg = await ch.send(item_text, view=view)
-            session["item_dropdown_message_id"] = new_msg.id
+            await edit
+            session.item_dropdown_message_id = existing_item_id
+            session.last_item_render = (existing_item_id, signature)
+            _swap_view(session, "item_view", view)
+            return
         except Exception:
-            session["item_dropdown_message_id"] = None
+            session.item_dropdown_message_id = None
+            existing_item_msg = None
+
+    if loot_sessions.get(session_id) is not session:
+        return
+    view = ItemDropdownView(session_id)
+    try:
+        new_msg = await ch.send(item_text, view=view)
+        _swap_view(session, "item_view", view)
+        session.item_dropdown_message_id = new_msg.id
+        session.item_msg = new_msg
+        session.last_item_render = (new_msg.id, signature)
+        session.item_msg_turn = (new_msg.id, session.current_turn)
+    except Exception:
+        session.item_dropdown_message_id = None
 
 
 def _schedule_refresh(session_id: int, delete_item: bool = True) -> asyncio.Task | None:
     """
-    Schedule a stored refresh task for a session. This helper cancels any
-    previously scheduled refresh task on the session and stores the new task
-    in session['refresh_task'] so it isn't garbage-collected prematurely.
-    Returns the scheduled Task or None if scheduling failed.
+    Request a refresh of the session's messages. Requests are coalesced: if a
+    refresh is already in flight it just marks the session dirty (OR-ing in
+    delete_item) and the running task renders once more with the latest state.
+    The task is stored in session.refresh_task so it isn't garbage-collected prematurely.
+    Returns the refresh Task or None if scheduling failed.
     """
     session = loot_sessions.get(session_id)
     if not session:
         return None
-    prev = session.get("refresh_task")
-    if prev and not prev.done():
-        try:
-            prev.cancel()
-        except Exception:
-            pass
+    session.refresh_pending = True
+    session.refresh_delete_item = session.refresh_delete_item or delete_item
+    running = session.refresh_task
+    if running and not running.done():
+        return running
     try:
-        t = asyncio.create_task(_refresh_all_messages(session_id, delete_item=delete_item))
-        session["refresh_task"] = t
+        t = asyncio.create_task(_drain_refreshes(session_id))
+        session.refresh_task = t
         return t
     except Exception:
-        session["refresh_task"] = None
+        session.refresh_task = None
         return None
 
-async def _schedule_session_timeout(session_id: int):
+async def _drain_refreshes(session_id: int):
     """
-    Sleep for SESSION_TIMEOUT_SECONDS and then expire/cleanup the session.
-    This removes the temporary messages and edits the control message with a timed-out summary.
+    Run _refresh_all_messages until no refresh request is pending, collapsing any
+    burst of requests that arrived mid-render into a single extra pass. Each pass
+    waits REFRESH_DEBOUNCE_SECONDS first so requests made in quick succession
+    (multi-item picks, repeated clicks) are rendered once, from the final state.
     """
-    try:
-        await asyncio.sleep(SESSION_TIMEOUT_SECONDS)
-    except asyncio.CancelledError:
-        return
+    while True:
+        await asyncio.sleep(REFRESH_DEBOUNCE_SECONDS)
+        session = loot_sessions.get(session_id)
+        if not session or not session.refresh_pending:
+            return
+        delete_item = session.refresh_delete_item
+        session.refresh_pending = False
+        session.refresh_delete_item = False
+        # Shielded so cancelling the drain task can't abort a render halfway through its edits.
+        await asyncio.shield(_refresh_all_messages(session_id, delete_item=delete_item))
 
-    session = loot_sessions.pop(session_id, None)
-    session_locks.pop(session_id, None)
+async def _expire_session(session_id: int):
+    """
+    Expire/cleanup a session whose timeout has elapsed (called from _timeout_loop).
+    This removes the temporary messages and edits the control message with a timed-out summary.
+    """
+    session = _end_session(session_id)
     if not session:
         return
-    ch = bot.get_channel(session["channel_id"])
+    ch = bot.get_channel(session.channel_id)
     if not ch:
         return
-    try:
-        lm = await _get_msg(ch, session.get("loot_list_message_id"))
+    final = build_final_summary_message(session, timed_out=True)
+
+    async def _retire_loot_list():
+        lm = await _get_msg(ch, session.loot_list_message_id)
+        if not lm:
+            return
         # If finalize view was shown, we had displayed the 'Last Assigned' list
         # and we should now replace it with the merged final summary instead
         # of leaving the last-assigned snapshot.
-        if lm:
-            if session.get("finalize_shown"):
-                try:
-                    merged = build_final_summary_message(session, timed_out=True)
-                    await lm.edit(content=merged)
-                except Exception:
-                    try:
-                        await lm.delete()
-                    except Exception:
-                        pass
-            else:
-                try:
-                    await lm.delete()
-                except Exception:
-                    pass
-    except Exception:
-        pass
-    try:
-        im = await _get_msg(ch, session.get("item_dropdown_message_id"))
-        if im:
-            await im.delete()
-    except Exception:
-        pass
-    final = build_final_summary_message(session, timed_out=True)
-    try:
-        ctrl = await _get_msg(ch, session_id)
-        if ctrl:
-            await ctrl.edit(content=final, view=None)
-    except Exception:
-        pass
+        if session.finalize_shown:
+            try:
+                await lm.edit(content=final)
+                return
+            except Exception:
+                pass
+        await lm.delete()
+
+    # The three cleanup calls touch different messages; run them side by side.
+    async with asyncio.TaskGroup() as tg:
+        tg.create_task(_ignore(_retire_loot_list()))
+        tg.create_task(_ignore(_delete_msg(ch, session.item_dropdown_message_id)))
+        tg.create_task(_ignore(_edit_msg(ch, session_id, content=final, view=None)))
 
 # ---------- Modal and command logic ----------
 class LootModal(nextcord.ui.Modal):
@@ -1480,12 +1803,18 @@ class LootModal(nextcord.ui.Modal):
         Modal callback performs safety checks and initializes the session.
         It also creates the three messages (loot list, control panel, and item dropdown).
         """
+        # Acknowledge first so validation and setup run inside the 15-minute followup
+        # window rather than the 3-second initial-response window.
+        await interaction.response.defer(ephemeral=True)
+
         channel_type = getattr(interaction.channel, "type", None)
         if channel_type in (nextcord.ChannelType.voice, nextcord.ChannelType.stage_voice):
-            await interaction.response.send_message("❌ Please run `/loot` in a regular text channel (not a voice-linked text chat).", ephemeral=True)
+            await interaction.followup.send(MSG_NOT_TEXT_CHANNEL, ephemeral=True)
             return
 
-        await interaction.response.defer(ephemeral=True)
+        if len(loot_sessions) >= MAX_ACTIVE_SESSIONS:
+            await interaction.followup.send("⏳ Too many loot sessions are running right now. Please try again in a few minutes.", ephemeral=True)
+            return
 
         if not (interaction.user and interaction.user.voice and interaction.user.voice.channel):
             await interaction.followup.send("❌ You must be in a voice channel to set up a loot roll.", ephemeral=True)
@@ -1495,82 +1824,77 @@ class LootModal(nextcord.ui.Modal):
         if not members:
             await interaction.followup.send("❌ I could not find anyone in your voice channel.", ephemeral=True)
             return
-        if len(members) > 20:
-            await interaction.followup.send(f"❌ Too many users in the voice channel ({len(members)})! The maximum is 20.", ephemeral=True)
+        if len(members) > MAX_ROLLERS:
+            await interaction.followup.send(f"❌ Too many users in the voice channel ({len(members)})! The maximum is {MAX_ROLLERS}.", ephemeral=True)
             return
 
-        # Roll generation with random tie-breakers for equal primary rolls
-        rolls = [{"member": m, "roll": random.randint(1, 100)} for m in members]
-        by_roll = {}
-        for r in rolls:
-            by_roll.setdefault(r["roll"], []).append(r)
-        for val, group in by_roll.items():
-            if len(group) > 1:
-                for r in group:
-                    r["tiebreak"] = random.randint(1, 100)
-
-        def _sort_key(r):
-            return (r["roll"], r.get("tiebreak", -1))
-        rolls.sort(key=_sort_key, reverse=True)
+        # Roll generation. Every roller also gets a distinct tie-breaker drawn in one
+        # random.sample call (at most MAX_ROLLERS members, so 1-100 always has room); it is only
+        # displayed for rolls that actually tied, and guarantees a strict order.
+        # The primary rolls are drawn in one random.choices call rather than a randint per member;
+        # with the roller cap this is already a couple of C-level calls, so no vectorized path.
+        tiebreaks = random.sample(ROLL_RANGE, len(members))
+        roll_values = random.choices(ROLL_RANGE, k=len(members))
+        # Rolls keep plain values only (id, display name, mention), resolved once here:
+        # renders never walk a Member object and the session holds no live Discord models.
+        rolls = [
+            Roll(m.id, m.display_name, m.mention, v, tb)
+            for m, v, tb in zip(members, roll_values, tiebreaks)
+        ]
+
+        rolls.sort(key=attrgetter("roll", "tiebreak"), reverse=True)
 
         # Parse the modal input for items; support Nx syntax
-        lines = self.loot_items.value.splitlines()
-        names = []
-        for l in lines:
-            s = l.strip()
-            if not s:
-                continue
-            m = re.match(r"(\d+)[xX]\s*(.*)", s)
-            if m:
-                try:
-                    c = int(m.group(1))
-                    nm = m.group(2).strip()
-                    if nm:
-                        names.extend([nm] * c)
-                    else:
-                        names.append(s)
-                except Exception:
-                    names.append(s)
-            else:
-                names.append(s)
+        names = _parse_item_names(self.loot_items.value)
 
-        items = [{"name": n, "assigned_to": None, "display_number": i} for i, n in enumerate(names, 1)]
+        items = [LootItem(n, i) for i, n in enumerate(names, 1)]
         if not items:
             await interaction.followup.send("⚠️ You must enter at least one item.", ephemeral=True)
             return
 
-        # send placeholders and then initialize session state
-        loot_msg = await interaction.followup.send("`Initializing Loot List (1/2)...`", wait=True)
-        control_msg = await interaction.channel.send("`Initializing Control Panel (2/2)...`")
+        # Build the session and both messages' contents first, so each message is sent
+        # once with its final content (no placeholder send + edit). Sessions are keyed by
+        # the control-panel message id, which only exists after sending, so the session
+        # is registered under the interaction id until then (snowflakes never collide).
+        session = LootSession(
+            rolls=rolls,
+            items=items,
+            unassigned_indices=[],
+            loot_lines=[],
+            assigned_lines=[],
+            select_options=[],
+            invoker_mention=interaction.user.mention,
+            invoker_id=interaction.user.id,
+            channel_id=interaction.channel.id,
+            loot_list_message_id=0,
+        )
+        _render_new_items(session, 0)
+        pending_id = interaction.id
+        loot_sessions[pending_id] = session
+        _reset_session_timeout(pending_id)
+        loot_content = _cached_loot_list(session)
+        control_content = _cached_control_panel(session)
+        control_view = ControlPanelView(pending_id)
+        try:
+            loot_msg = await interaction.followup.send(loot_content, wait=True)
+            control_msg = await interaction.channel.send(control_content, view=control_view)
+        finally:
+            loot_sessions.pop(pending_id, None)
 
         session_id = control_msg.id
-        session = {
-            "rolls": rolls,
-            "items": items,
-            "current_turn": TURN_NOT_STARTED,
-            "invoker_id": interaction.user.id,
-            "invoker": interaction.user,
-            "selected_items": None,
-            "round": 0,
-            "direction": 1,
-            "just_reversed": False,
-            "members_to_remove": None,  # stored as list[str] matching SelectOption.value
-            "channel_id": control_msg.channel.id,
-            "loot_list_message_id": loot_msg.id,
-            "item_dropdown_message_id": None,
-            "last_action": None,
-            "last_control_content": None,
-            "last_loot_content": None,
-            "timeout_task": None,
-            "assignment_counter": 0
-        }
+        control_view.session_id = session_id
+        session.loot_list_message_id = loot_msg.id
+        # The followup's WebhookMessage edits through the interaction token, which expires
+        # after 15 minutes; cache a bot-token handle instead (None: resolve via _get_msg).
+        partial = getattr(interaction.channel, "get_partial_message", None)
+        session.loot_msg = partial(loot_msg.id) if callable(partial) else None
+        session.control_msg = control_msg
+        session.control_view = control_view
+        session.last_loot_content = loot_content
+        session.last_control_content = control_content
+        session.last_control_view = _control_view_signature(session)
         loot_sessions[session_id] = session
-        await _reset_session_timeout(session_id)
-
-        await loot_msg.edit(content=build_loot_list_message(session))
-        await control_msg.edit(content=build_control_panel_message(session), view=ControlPanelView(session_id))
-        session["last_control_content"] = build_control_panel_message(session)
-        session["last_loot_content"] = build_loot_list_message(session)
+        _reset_session_timeout(session_id)
 
         # create item dropdown via refresh task (delete/create behavior handled there)
         _schedule_refresh(session_id, delete_item=True)
@@ -1585,7 +1909,7 @@ async def loot(interaction: nextcord.Interaction):
     ch_type = getattr(interaction.channel, "type", None)
     if ch_type in (nextcord.ChannelType.voice, nextcord.ChannelType.stage_voice):
         await interaction.response.send_message(
-            "❌ Please run `/loot` in a regular text channel (not a voice-linked text chat).",
+            MSG_NOT_TEXT_CHANNEL,
             ephemeral=True
         )
         return
@@ -1604,10 +1928,44 @@ async def loot(interaction: nextcord.Interaction):
     await interaction.response.send_modal(LootModal())
 
 # ---------- Events and run ----------
+_health_runner: web.AppRunner | None = None
+
+async def _health(request: web.Request) -> web.Response:
+    return web.Response(body=b"alive", content_type="text/plain")
+
+async def _start_health_server(port: int) -> None:
+    """
+    Serve a minimal keep-alive endpoint for hosts that require an open HTTP port.
+    Opt-in via KEEPALIVE_PORT (not PORT, which many hosts set on their own).
+    Runs on the bot's own event loop via aiohttp (a nextcord dependency), so there
+    is no web-server thread competing with gateway and interaction handling.
+    """
+    global _health_runner
+    app = web.Application()
+    app.router.add_get("/", _health)
+    # Uptime pingers hit this constantly; don't format an access-log line for each one.
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    try:
+        await web.TCPSite(runner, "0.0.0.0", port).start()
+    except OSError:
+        # e.g. the previous instance still holds the port during a redeploy: release
+        # the runner and leave _health_runner unset so the next on_ready retries.
+        await runner.cleanup()
+        raise
+    _health_runner = runner
+
 @bot.event
 async def on_ready():
-    """Log a minimal ready message when the bot connects."""
+    """Log a minimal ready message when the bot connects, and start the keep-alive endpoint if KEEPALIVE_PORT is set."""
     print(f"RNGenie ready as {bot.user}")
+    port = os.getenv("KEEPALIVE_PORT")
+    # on_ready fires again after reconnects; only start the endpoint once.
+    if port and _health_runner is None:
+        try:
+            await _start_health_server(int(port))
+        except (ValueError, OSError) as e:
+            print(f"Keep-alive endpoint not started: {e}")
 
 @bot.event
 async def on_application_command_error(interaction: nextcord.Interaction, error: Exception):
@@ -1618,16 +1976,19 @@ async def on_application_command_error(interaction: nextcord.Interaction, error:
     try:
         if not interaction.is_expired():
             if interaction.response.is_done():
-                await interaction.followup.send("❌ An unexpected error occurred.", ephemeral=True)
+                await interaction.followup.send(MSG_UNEXPECTED_ERROR, ephemeral=True)
             else:
-                await interaction.response.send_message("❌ An unexpected error occurred.", ephemeral=True)
+                await interaction.response.send_message(MSG_UNEXPECTED_ERROR, ephemeral=True)
     except Exception:
         pass
 
-if __name__ == "__main__":
-    # Load token from .env and run the bot
+def main() -> None:
+    """Load the token from .env and run the bot (shared by RNGenie.py and RNGenie_deploy.py)."""
     load_dotenv()
     token = os.getenv("DISCORD_TOKEN")
     if not token:
         raise SystemExit("DISCORD_TOKEN environment variable required.")
     bot.run(token)
+
+if __name__ == "__main__":
+    main()